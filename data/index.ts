@@ -2,6 +2,7 @@ import data from './data.json';
 import givesCases from './gives_cases.json';
 import needsCasesRaw from './needs_cases.json';
 import imagesMap from './images_map.json';
+import imagesVariants from './images_variants.json';
 
 export * from "./types";
 
@@ -12,6 +13,24 @@ const imageForId = (id: string): string => {
     return map[id] || `/images/generated/${id}.jpg`;
 };
 
+type ImageVariant = { url: string; format: string; width: number; height: number; bytes: number };
+type ImageSource = { type?: string; srcSet: string };
+
+// Responsive sources derived by generate_images_langchain.py --derive (AVIF, WebP, then JPEG fallback).
+// Only applies while the card still shows its generated image.
+export const imageSourcesForId = (id: string | undefined, imageUrl: string): ImageSource[] => {
+	const index = (imagesVariants as Record<string, { source?: string; variants?: ImageVariant[] }>) || {};
+	const entry = id ? index[id] : undefined;
+	if (!entry || entry.source !== imageUrl || !entry.variants?.length) return [];
+	const types: Record<string, string | undefined> = { avif: 'image/avif', webp: 'image/webp', jpeg: undefined };
+	return Object.keys(types)
+		.map((format) => ({
+			type: types[format],
+			srcSet: entry.variants!.filter((v) => v.format === format).map((v) => `${v.url} ${v.width}w`).join(', '),
+		}))
+		.filter((s) => s.srcSet);
+};
+
 const withLocalImage = <T extends { id: string; imageUrl?: string }>(arr: T[]): T[] =>
 	arr.map((it) => ({ ...it, imageUrl: imageForId(it.id) }));
 
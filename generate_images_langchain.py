@@ -7,15 +7,29 @@ and save to public/images/generated/<id>.jpg for the frontend to consume.
 
 Flow:
 1) Build a base image prompt from item details.
-2) (Optional) Refine the prompt with a chat model via LangChain's ChatOpenAI.
+2) (Optional) Refine the prompts with a chat model via LangChain's ChatOpenAI, in concurrent
+   batches through one shared client; refined prompts are cached in the manifest.
 3) Generate a square image via OpenAI Images API (gpt-image-1).
 4) Convert PNG -> JPEG and save under public/images/generated/<id>.jpg.
 
 Usage:
   OPENAI_API_KEY=sk-... python3 generate_images_langchain.py --size 1024 --limit 20
+  OPENAI_API_KEY=sk-... python3 generate_images_langchain.py --workers 8 --rpm 50
 
 Notes:
 - Idempotent: overwrites images with the same id unless you omit --overwrite.
+- Cards are processed by --workers threads; Images API calls share a token bucket
+  (--rpm requests/minute, bursts up to --burst) so the pool stays under the account limit.
+- Progress is checkpointed to public/images/generated/.checkpoint.json; an interrupted run
+  with the same options resumes where it stopped (--fresh ignores the checkpoint).
+- data/images_manifest.json maps each card id to a hash of its prompt inputs (title, category,
+  description, size, models) and caches its refined prompt. Only cards whose hash changed
+  are refined and regenerated; existing images without an entry are adopted as current.
+  The manifest and data/images_map.json are rewritten atomically after every image.
+- --derive (after generation) or --derive-only (no API calls) writes responsive variants of
+  each existing image (widths in VARIANT_WIDTHS; AVIF when Pillow supports it, WebP, and a
+  progressive JPEG fallback) to public/images/generated/variants/ using a process pool, and
+  records every variant with its byte size in data/images_variants.json.
 - Reads items from data/*.json: data.json, needs_cases.json, gives_cases.json.
 - Use --dry-run to print actions without any API calls or file writes.
 - Allowed sizes: auto | 1024x1024 | 1024x1536 | 1536x1024
@@ -25,9 +39,12 @@ from __future__ import annotations
 
 import argparse
 import base64
+import hashlib
 import json
 import os
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Iterable, List, Optional
@@ -61,6 +78,13 @@ ROOT = Path(__file__).resolve().parent
 DATA_DIR = ROOT / "data"
 PUBLIC_DIR = ROOT / "public" / "images" / "generated"
 PUBLIC_DIR.mkdir(parents=True, exist_ok=True)
+CHECKPOINT_PATH = PUBLIC_DIR / ".checkpoint.json"
+MANIFEST_PATH = DATA_DIR / "images_manifest.json"
+IMAGES_MAP_PATH = DATA_DIR / "images_map.json"
+IMAGE_MODEL = "gpt-image-1"
+VARIANTS_DIR = PUBLIC_DIR / "variants"
+VARIANTS_INDEX_PATH = DATA_DIR / "images_variants.json"
+VARIANT_WIDTHS = (256, 512, 1024)
 
 
 # -----------------------------
@@ -144,28 +168,63 @@ def build_image_prompt(card: Card) -> str:
     return "\n".join(parts)
 
 
+_CHAT_MODELS: dict = {}
+_CHAT_LOCK = threading.Lock()
+
+
+def get_chat_model(model: str):
+    """One shared ChatOpenAI client per model (reuses its HTTP connection pool)."""
+    with _CHAT_LOCK:
+        if model not in _CHAT_MODELS:
+            # Use LangChain defaults (e.g., default temperature)
+            _CHAT_MODELS[model] = ChatOpenAI(model=model)
+        return _CHAT_MODELS[model]
+
+
+def refinement_messages(base_prompt: str) -> list:
+    return [
+        SystemMessage(content="You are an elite prompt engineer for image generation. Return only the final prompt."),
+        HumanMessage(content=(
+            "Given these requirements, write a vivid, safe prompt for the Images API.\n"
+            "Rules: no brand names, no text in the image, no logos, square composition, illustrative (not photorealistic).\n\n"
+            f"Requirements:\n{base_prompt}"
+        )),
+    ]
+
+
 def refine_prompt_with_llm_langchain(base_prompt: str, model: str) -> str:
     """Refine the prompt with LangChain's ChatOpenAI. Return only the final prompt text."""
     if not _HAS_LANGCHAIN:
         return base_prompt
     try:
-        # Use LangChain defaults (e.g., default temperature)
-        llm = ChatOpenAI(model=model)
-        messages = [
-            SystemMessage(content="You are an elite prompt engineer for image generation. Return only the final prompt."),
-            HumanMessage(content=(
-                "Given these requirements, write a vivid, safe prompt for the Images API.\n"
-                "Rules: no brand names, no text in the image, no logos, square composition, illustrative (not photorealistic).\n\n"
-                f"Requirements:\n{base_prompt}"
-            )),
-        ]
-        resp = llm.invoke(messages)
+        resp = get_chat_model(model).invoke(refinement_messages(base_prompt))
         content = (resp.content or "").strip()
         return content if content else base_prompt
     except Exception:
         return base_prompt
 
 
+def refine_prompts_batch(base_prompts: List[str], model: str, concurrency: int = 8) -> List[str]:
+    """Refine many prompts through one client with concurrent requests (LangChain batch).
+    Any prompt whose refinement fails is returned unchanged.
+    """
+    if not _HAS_LANGCHAIN or not base_prompts:
+        return list(base_prompts)
+    try:
+        resps = get_chat_model(model).batch(
+            [refinement_messages(p) for p in base_prompts],
+            config={"max_concurrency": max(1, concurrency)},
+            return_exceptions=True,
+        )
+    except Exception:
+        return list(base_prompts)
+    out: List[str] = []
+    for base, resp in zip(base_prompts, resps):
+        content = "" if isinstance(resp, Exception) else (getattr(resp, "content", "") or "").strip()
+        out.append(content or base)
+    return out
+
+
 # -----------------------------
 # Image Generation (OpenAI SDK)
 # -----------------------------
@@ -193,7 +252,7 @@ def generate_image_bytes(client: OpenAI, prompt: str, size: str) -> bytes:
     - We pass only required args to respect API defaults.
     """
     resp = client.images.generate(
-        model="gpt-image-1",
+        model=IMAGE_MODEL,
         prompt=prompt,
         size=size,  # must be one of ALLOWED_SIZES
     )
@@ -222,10 +281,17 @@ def png_to_jpeg_bytes(png_bytes: bytes, quality: int = 88) -> bytes:
         return out.getvalue()
 
 
-def save_jpeg(jpeg_bytes: bytes, path: Path) -> None:
+def write_atomic(data: bytes, path: Path) -> None:
+    """Write via a temp file + rename so an interrupted run never leaves a partial file."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "wb") as f:
-        f.write(jpeg_bytes)
+    tmp = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def save_jpeg(jpeg_bytes: bytes, path: Path) -> None:
+    write_atomic(jpeg_bytes, path)
 
 
 def backoff_sleep(attempt: int) -> None:
@@ -233,6 +299,249 @@ def backoff_sleep(attempt: int) -> None:
     time.sleep(min(1.5 * (2 ** attempt), 10))
 
 
+class TokenBucket:
+    """Thread-safe token bucket: refills `rpm` tokens per minute, holds at most `burst`.
+    rpm <= 0 disables limiting.
+    """
+
+    def __init__(self, rpm: float, burst: int = 1) -> None:
+        self.rate = rpm / 60.0
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# -----------------------------
+# Checkpointing
+# -----------------------------
+
+def load_checkpoint(signature: dict) -> set:
+    """Ids finished by a previous run with the same options (empty if none/mismatched)."""
+    try:
+        data = load_json(CHECKPOINT_PATH)
+    except Exception:
+        return set()
+    if data.get("signature") != signature:
+        return set()
+    return set(data.get("done") or [])
+
+
+def save_checkpoint(signature: dict, done: set) -> None:
+    payload = {"signature": signature, "done": sorted(done)}
+    write_atomic(json.dumps(payload, ensure_ascii=False).encode("utf-8"), CHECKPOINT_PATH)
+
+
+# -----------------------------
+# Manifest (content-addressed skip)
+# -----------------------------
+
+def _digest(obj: Any) -> str:
+    raw = json.dumps(obj, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def input_hash(card: Card, size: str, llm_model: Optional[str]) -> str:
+    """Hash of everything that determines the image; llm_model is None without refinement."""
+    return _digest({
+        "title": card.title,
+        "category": card.category,
+        "description": card.description,
+        "size": size,
+        "model": IMAGE_MODEL,
+        "llm_model": llm_model,
+    })
+
+
+def prompt_key(base_prompt: str, llm_model: str) -> str:
+    """Cache key for a refined prompt (independent of image size)."""
+    return _digest({"prompt": base_prompt, "llm_model": llm_model})
+
+
+def load_manifest() -> dict:
+    try:
+        data = load_json(MANIFEST_PATH)
+    except Exception:
+        return {}
+    return data.get("items") or {}
+
+
+def save_manifest(items: dict, images_map: dict) -> None:
+    """Write the manifest, then the frontend image map, each atomically."""
+    write_atomic(
+        json.dumps({"version": 1, "items": dict(sorted(items.items()))}, ensure_ascii=False, indent=2).encode("utf-8"),
+        MANIFEST_PATH,
+    )
+    write_atomic(json.dumps(images_map, ensure_ascii=False, indent=2).encode("utf-8"), IMAGES_MAP_PATH)
+
+
+# -----------------------------
+# Per-card pipeline
+# -----------------------------
+
+def generate_card(card: Card, *, client: Optional[OpenAI], size: str, use_llm: bool,
+                  llm_model: str, dry_run: bool, limiter: TokenBucket,
+                  cached_prompt: Optional[str] = None) -> str:
+    """Refine prompt, generate, convert and save one card; returns the prompt used.
+    Runs inside a worker thread; retries back off in this thread only, so other workers
+    keep going.
+    """
+    out_path = PUBLIC_DIR / f"{card.id}.jpg"
+    base_prompt = build_image_prompt(card)
+    if not use_llm:
+        final_prompt = base_prompt
+    elif cached_prompt:
+        final_prompt = cached_prompt
+    else:
+        final_prompt = refine_prompt_with_llm_langchain(base_prompt, llm_model)
+
+    if dry_run:
+        print(f"[DRY] Would generate {out_path.name} with size={size} and prompt:\n{final_prompt}\n")
+        return final_prompt
+
+    # Call Images API with retries
+    png_bytes: Optional[bytes] = None
+    last_err: Optional[BaseException] = None
+    for attempt in range(5):
+        limiter.acquire()
+        try:
+            png_bytes = generate_image_bytes(client, final_prompt, size=size)
+            break
+        except Exception as e:
+            last_err = e
+            backoff_sleep(attempt)
+
+    if png_bytes is None:
+        raise RuntimeError(f"Images API failed for {card.id}: {last_err}")
+
+    # Convert to JPEG and save
+    jpeg_bytes = png_to_jpeg_bytes(png_bytes, quality=88)
+    save_jpeg(jpeg_bytes, out_path)
+    return final_prompt
+
+
+# -----------------------------
+# Responsive variants
+# -----------------------------
+
+def register_avif() -> None:
+    """Register the pillow-avif-plugin encoder (older Pillow) in this process. Runs in
+    the parent and as the pool initializer, since spawned workers do not inherit it.
+    """
+    try:
+        import pillow_avif  # noqa: F401
+    except Exception:
+        pass
+
+
+def supported_variant_formats() -> List[str]:
+    """Modern formats first; AVIF only when this Pillow build can encode it."""
+    register_avif()
+    Image.init()
+    formats = ["avif"] if "AVIF" in Image.SAVE else []
+    return formats + ["webp", "jpeg"]
+
+
+def derive_variants(card_id: str, src: str, widths: List[int], formats: List[str]) -> dict:
+    """Write resized variants of one source image; returns its index entry.
+    Module-level so it can run in a ProcessPoolExecutor worker.
+    """
+    src_path = Path(src)
+    raw = src_path.read_bytes()
+    variants = []
+    with Image.open(BytesIO(raw)) as im:
+        rgb = im.convert("RGB")
+        # Never upscale; the source width itself is always emitted
+        targets = sorted({w for w in widths if w < rgb.width} | {rgb.width})
+        for width in targets:
+            height = round(rgb.height * width / rgb.width)
+            resized = rgb if width == rgb.width else rgb.resize((width, height), Image.LANCZOS)
+            for fmt in formats:
+                out = BytesIO()
+                if fmt == "jpeg":
+                    resized.save(out, format="JPEG", quality=82, optimize=True, progressive=True)
+                elif fmt == "webp":
+                    resized.save(out, format="WEBP", quality=80, method=6)
+                else:
+                    resized.save(out, format="AVIF", quality=60)
+                ext = "jpg" if fmt == "jpeg" else fmt
+                name = f"{card_id}-{width}.{ext}"
+                write_atomic(out.getvalue(), VARIANTS_DIR / name)
+                variants.append({
+                    "url": f"/images/generated/variants/{name}",
+                    "format": fmt,
+                    "width": width,
+                    "height": height,
+                    "bytes": len(out.getvalue()),
+                })
+    return {
+        "source": f"/images/generated/{src_path.name}",
+        "sourceBytes": len(raw),
+        "sourceHash": hashlib.sha256(raw).hexdigest(),
+        "variants": variants,
+    }
+
+
+def run_derivation(items: List[Card], *, workers: int, overwrite: bool) -> int:
+    """Derive variants for every card that has a generated image; skips sources whose
+    hash matches the index unless overwrite. Returns the number of images processed.
+    """
+    try:
+        index = load_json(VARIANTS_INDEX_PATH)
+    except Exception:
+        index = {}
+    formats = supported_variant_formats()
+    todo = []
+    for card in items:
+        src = PUBLIC_DIR / f"{card.id}.jpg"
+        if not src.exists():
+            continue
+        entry = index.get(card.id) or {}
+        formats_done = {v.get("format") for v in entry.get("variants", [])}
+        if (not overwrite and set(formats) <= formats_done
+                and entry.get("sourceHash") == hashlib.sha256(src.read_bytes()).hexdigest()):
+            continue
+        todo.append((card.id, str(src)))
+
+    processed = 0
+    failures: List[str] = []
+    with ProcessPoolExecutor(max_workers=workers or None, initializer=register_avif) as pool:
+        futures = {
+            pool.submit(derive_variants, card_id, src, list(VARIANT_WIDTHS), formats): card_id
+            for card_id, src in todo
+        }
+        for fut in tqdm(as_completed(futures), total=len(futures), desc="Deriving variants", ncols=100):
+            card_id = futures[fut]
+            try:
+                index[card_id] = fut.result()
+            except Exception as e:
+                failures.append(f"{card_id}: {e}")
+                continue
+            processed += 1
+    if processed:
+        write_atomic(
+            json.dumps(dict(sorted(index.items())), ensure_ascii=False, indent=2).encode("utf-8"),
+            VARIANTS_INDEX_PATH,
+        )
+    if failures:
+        raise SystemExit(f"Derived {processed} images; {len(failures)} failed:\n" + "\n".join(failures))
+    return processed
+
+
 # -----------------------------
 # CLI Main
 # -----------------------------
@@ -250,6 +559,15 @@ def main() -> None:
     parser.add_argument("--llm-model", type=str, default="gpt-4o-mini", help="Chat model for prompt refinement (LangChain)")
     parser.add_argument("--overwrite", action="store_true", help="Re-generate even if the file already exists")
     parser.add_argument("--dry-run", action="store_true", help="Print actions without calling APIs")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent cards in flight (default: 4)")
+    parser.add_argument("--rpm", type=float, default=5, help="Images API requests per minute across workers (0 = unlimited, default: 5)")
+    parser.add_argument("--burst", type=int, default=1, help="Requests allowed back-to-back before --rpm pacing applies (default: 1)")
+    parser.add_argument("--fresh", action="store_true", help="Ignore the checkpoint of an interrupted run")
+    parser.add_argument("--refine-batch", type=int, default=16, help="Prompts refined per batch before image generation (default: 16)")
+    parser.add_argument("--refine-concurrency", type=int, default=8, help="Concurrent refinement requests within a batch (default: 8)")
+    parser.add_argument("--derive", action="store_true", help="After generating, derive responsive WebP/AVIF/JPEG variants")
+    parser.add_argument("--derive-only", action="store_true", help="Only derive variants from existing images (no API calls)")
+    parser.add_argument("--derive-workers", type=int, default=0, help="Processes for variant derivation (0 = CPU count)")
     args = parser.parse_args()
 
     # Normalize/validate size early (fail fast for unsupported values such as 512/512x512)
@@ -258,6 +576,14 @@ def main() -> None:
     except ValueError as e:
         raise SystemExit(str(e))
 
+    if args.derive_only:
+        items = list(iter_cards())
+        if args.limit and args.limit > 0:
+            items = items[: args.limit]
+        derived = run_derivation(items, workers=args.derive_workers, overwrite=args.overwrite)
+        print(f"Done. Derived variants for {derived} images into {VARIANTS_DIR}")
+        return
+
     if args.dry_run:
         print("[INFO] Dry run enabled: will NOT call APIs or write any image files.\n")
 
@@ -271,47 +597,117 @@ def main() -> None:
     if args.limit and args.limit > 0:
         items = items[: args.limit]
 
-    processed = 0
-    for card in tqdm(items, desc="Generating images", ncols=100):
-        out_path = PUBLIC_DIR / f"{card.id}.jpg"
-        if out_path.exists() and not args.overwrite:
-            continue
-
-        base_prompt = build_image_prompt(card)
-        final_prompt = (
-            refine_prompt_with_llm_langchain(base_prompt, args.llm_model)
-            if (args.use_llm)
-            else base_prompt
-        )
-
-        if args.dry_run:
-            print(f"[DRY] Would generate {out_path.name} with size={normalized_size} and prompt:\n{final_prompt}\n")
-            processed += 1
-            continue
+    signature = {
+        "size": normalized_size,
+        "use_llm": args.use_llm,
+        "llm_model": args.llm_model,
+        "overwrite": args.overwrite,
+        "limit": args.limit,
+    }
+    done = set() if (args.fresh or args.dry_run) else load_checkpoint(signature)
+    if done:
+        print(f"[INFO] Resuming: {len(done)} items already completed by an interrupted run.")
+
+    manifest = load_manifest()
+    try:
+        images_map = load_json(IMAGES_MAP_PATH)
+    except Exception:
+        images_map = {}
+    hash_llm = args.llm_model if args.use_llm else None
+    hashes = {card.id: input_hash(card, normalized_size, hash_llm) for card in items}
+
+    # Images generated before the manifest existed are taken as current rather than re-bought
+    adopted = 0
+    for card in items:
+        if card.id not in manifest and (PUBLIC_DIR / f"{card.id}.jpg").exists():
+            manifest[card.id] = {"hash": hashes[card.id], "file": f"{card.id}.jpg"}
+            adopted += 1
+    if adopted and not args.dry_run:
+        print(f"[INFO] Adopted {adopted} existing images into {MANIFEST_PATH.name}.")
+        save_manifest(manifest, images_map)
+
+    def is_current(card: Card) -> bool:
+        entry = manifest.get(card.id) or {}
+        return entry.get("hash") == hashes[card.id] and (PUBLIC_DIR / f"{card.id}.jpg").exists()
+
+    def cached_prompt(card: Card) -> Optional[str]:
+        entry = manifest.get(card.id) or {}
+        if args.use_llm and entry.get("promptKey") == prompt_key(build_image_prompt(card), args.llm_model):
+            return entry.get("prompt")
+        return None
+
+    todo = [
+        card for card in items
+        if card.id not in done
+        and (args.overwrite or not is_current(card))
+    ]
+    limiter = TokenBucket(args.rpm, args.burst)
+
+    # Refine all missing prompts up front in batches; results are cached in the manifest
+    prompts: dict = {}
+    if args.use_llm:
+        for card in todo:
+            cached = cached_prompt(card)
+            if cached:
+                prompts[card.id] = cached
+        pending = [card for card in todo if card.id not in prompts]
+        batch = max(1, args.refine_batch)
+        for i in tqdm(range(0, len(pending), batch), desc="Refining prompts", ncols=100):
+            chunk = pending[i : i + batch]
+            bases = [build_image_prompt(card) for card in chunk]
+            refined = refine_prompts_batch(bases, args.llm_model, args.refine_concurrency)
+            for card, base, final in zip(chunk, bases, refined):
+                prompts[card.id] = final
+                if final != base:  # not a failed refinement
+                    entry = manifest.setdefault(card.id, {})
+                    entry["prompt"] = final
+                    entry["promptKey"] = prompt_key(base, args.llm_model)
+            if not args.dry_run:
+                save_manifest(manifest, images_map)
 
-        # Call Images API with retries
-        png_bytes: Optional[bytes] = None
-        last_err: Optional[BaseException] = None
-        for attempt in range(5):
+    processed = 0
+    failures: List[str] = []
+    pool = ThreadPoolExecutor(max_workers=max(1, args.workers))
+    try:
+        futures = {
+            pool.submit(
+                generate_card, card,
+                client=client, size=normalized_size, use_llm=args.use_llm,
+                llm_model=args.llm_model, dry_run=args.dry_run, limiter=limiter,
+                cached_prompt=prompts.get(card.id),
+            ): card
+            for card in todo
+        }
+        for fut in tqdm(as_completed(futures), total=len(futures), desc="Generating images", ncols=100):
+            card = futures[fut]
             try:
-                png_bytes = generate_image_bytes(
-                    client,
-                    final_prompt,
-                    size=normalized_size,
-                )
-                break
+                fut.result()
             except Exception as e:
-                last_err = e
-                backoff_sleep(attempt)
-
-        if png_bytes is None:
-            raise RuntimeError(f"Images API failed for {card.id}: {last_err}")
+                failures.append(f"{card.id}: {e}")
+                continue
+            processed += 1
+            if not args.dry_run:
+                entry = manifest.setdefault(card.id, {})
+                entry.update({"hash": hashes[card.id], "file": f"{card.id}.jpg"})
+                images_map[card.id] = f"/images/generated/{card.id}.jpg"
+                save_manifest(manifest, images_map)
+                done.add(card.id)
+                save_checkpoint(signature, done)
+    except KeyboardInterrupt:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise SystemExit(f"Interrupted after {processed} images; re-run with the same options to resume.")
+    pool.shutdown()
+
+    if failures:
+        raise SystemExit(
+            f"Generated {processed} images; {len(failures)} failed (re-run to retry them):\n" + "\n".join(failures)
+        )
+    if not args.dry_run:
+        CHECKPOINT_PATH.unlink(missing_ok=True)
 
-        # Convert to JPEG and save
-        jpeg_bytes = png_to_jpeg_bytes(png_bytes, quality=88)
-        save_jpeg(jpeg_bytes, out_path)
-        processed += 1
-        time.sleep(0.25)  # polite pacing
+    if args.derive and not args.dry_run:
+        derived = run_derivation(items, workers=args.derive_workers, overwrite=args.overwrite)
+        print(f"Derived variants for {derived} images into {VARIANTS_DIR}")
 
     if args.dry_run:
         print(f"Done (dry run). Simulated generating {processed} images. To actually write files, re-run without --dry-run.")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Decode benchmark for large /match bodies: MatchRequest (pydantic) vs fast_decode.
+
+Builds a synthetic body from the data.json cards (ids made unique, --cards per side)
+and measures, per decoder:
+- time: median wall time of decoding the raw JSON bytes
+- peak: tracemalloc peak while decoding
+- retained: memory still held by the decoded request
+
+Usage (from server/):
+  python3 bench_decode.py --cards 2000 --runs 5
+  python3 bench_decode.py --cards 2000 --json   # machine-readable, for tracking over time
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+from fast_decode import decode_match_request
+from main import MatchRequest
+
+HERE = Path(__file__).resolve().parent
+
+
+def make_body(cards: int) -> bytes:
+    data = json.loads((HERE.parent / "data" / "data.json").read_text(encoding="utf-8"))
+    sides = {}
+    for side in ("needs", "gives"):
+        seed = data[side]
+        sides[side] = [{**seed[i % len(seed)], "id": f"{side}-{i}"} for i in range(cards)]
+    return json.dumps({**sides, "top_k": 5}, ensure_ascii=False).encode("utf-8")
+
+
+DECODERS = {
+    "pydantic": MatchRequest.model_validate_json,
+    "fast": decode_match_request,
+}
+
+
+def measure(decode, body: bytes, runs: int) -> dict:
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        decode(body)
+        times.append(time.perf_counter() - t0)
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    req = decode(body)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del req
+    return {
+        "median_ms": round(statistics.median(times) * 1000, 2),
+        "peak_kib": round((peak - base) / 1024, 1),
+        "retained_kib": round((current - base) / 1024, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark MatchRequest decoding: pydantic vs fast path.")
+    parser.add_argument("--cards", type=int, default=2000, help="Cards per side (default: 2000)")
+    parser.add_argument("--runs", type=int, default=5, help="Timed decodes per decoder (default: 5)")
+    parser.add_argument("--json", action="store_true", help="Print a JSON summary")
+    args = parser.parse_args()
+
+    body = make_body(max(1, args.cards))
+    summary = {name: measure(fn, body, max(1, args.runs)) for name, fn in DECODERS.items()}
+
+    if args.json:
+        print(json.dumps({"cards": args.cards, "body_kib": round(len(body) / 1024, 1), **summary}))
+        return
+    print(f"body: {len(body) / 1024:.1f} KiB, {args.cards} needs + {args.cards} gives")
+    for name, stats in summary.items():
+        print(f"{name:>8}: median {stats['median_ms']:.2f} ms, peak {stats['peak_kib']:.1f} KiB, "
+              f"retained {stats['retained_kib']:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
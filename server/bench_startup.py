@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Cold-start benchmark for the API server.
+
+Measures, in fresh interpreters (so nothing is cached):
+- import: `import main` (module import incl. FastAPI app construction)
+- warmup: warm_caches() right after import (corpus parse, vocabularies, indexes)
+
+Usage (from server/):
+  python3 bench_startup.py --runs 5
+  python3 bench_startup.py --runs 5 --json   # machine-readable, for tracking over time
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+PROBE = """
+import json, time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+main.warm_caches()
+t2 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "warmup": t2 - t1}))
+"""
+
+
+def run_once() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=HERE, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark server import and cache warmup time.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to sample (default: 5)")
+    parser.add_argument("--json", action="store_true", help="Print a JSON summary")
+    args = parser.parse_args()
+
+    samples = [run_once() for _ in range(max(1, args.runs))]
+    summary = {}
+    for key in ("import", "warmup"):
+        vals = [s[key] for s in samples]
+        summary[key] = {"median_ms": round(statistics.median(vals) * 1000, 2), "max_ms": round(max(vals) * 1000, 2)}
+
+    if args.json:
+        print(json.dumps({"runs": len(samples), **summary}))
+        return
+    for key, stats in summary.items():
+        print(f"{key:>7}: median {stats['median_ms']:.2f} ms, max {stats['max_ms']:.2f} ms ({len(samples)} runs)")
+
+
+if __name__ == "__main__":
+    main()
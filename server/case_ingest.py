@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Streaming ingestion of project case files (data/gives_cases.json) into give cards.
+
+Case files are a top-level JSON array of records such as
+  {"year": 2023, "month": 3, "org": "...", "name": "...", "content": "...", "productized": 0, "link": "..."}
+
+Records are decoded one at a time from fixed-size text chunks, so memory holds one
+chunk plus the record being decoded no matter how large the file is. Tags, skills
+and category come from an `analyze(title, description)` callable run on the project
+description; the server passes its heuristic /enrich analyzer.
+
+Usage (from server/):
+  python3 case_ingest.py                     # print ingested cards as JSON lines
+  python3 case_ingest.py --limit 5 --source ../data/gives_cases.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_CASES = HERE.parent / "data" / "gives_cases.json"
+
+CHUNK_CHARS = 1 << 16
+MAX_RECORD_CHARS = 1 << 20
+
+_WS = " \t\r\n"
+
+
+def iter_json_array(path: Path, *, chunk_chars: int = CHUNK_CHARS,
+                    max_record_chars: int = MAX_RECORD_CHARS) -> Iterator[object]:
+    """Yield the elements of a top-level JSON array without loading the whole file.
+    Raises ValueError on malformed input or when one element exceeds `max_record_chars`.
+    """
+    decoder = json.JSONDecoder()
+    with path.open("r", encoding="utf-8") as f:
+        buf = ""
+        pos = 0
+        eof = False
+
+        def fill() -> bool:
+            nonlocal buf, pos, eof
+            if eof:
+                return False
+            chunk = f.read(chunk_chars)
+            if not chunk:
+                eof = True
+                return False
+            buf = buf[pos:] + chunk
+            pos = 0
+            return True
+
+        def skip_ws() -> Optional[str]:
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in _WS:
+                    pos += 1
+                if pos < len(buf):
+                    return buf[pos]
+                if not fill():
+                    return None
+
+        fill()
+        if buf.startswith("\ufeff"):
+            pos = 1
+        if skip_ws() != "[":
+            raise ValueError(f"{path}: expected a top-level JSON array")
+        pos += 1
+        if skip_ws() == "]":
+            return
+        while True:
+            if skip_ws() is None:
+                raise ValueError(f"{path}: unexpected end of file")
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buf, pos)
+                    # A number at the chunk edge may decode short; make sure it is terminated
+                    if end == len(buf) and not eof:
+                        raise json.JSONDecodeError("incomplete", buf, end)
+                    break
+                except json.JSONDecodeError:
+                    if len(buf) - pos > max_record_chars:
+                        raise ValueError(f"{path}: record exceeds {max_record_chars} characters")
+                    if not fill():
+                        raise ValueError(f"{path}: malformed record near character {pos}")
+            pos = end
+            yield item
+            sep = skip_ws()
+            if sep == ",":
+                pos += 1
+            elif sep == "]":
+                return
+            else:
+                raise ValueError(f"{path}: expected ',' or ']' after record")
+
+
+def case_id(record: dict, idx: int) -> str:
+    """Same id the frontend gives the record's card (data/index.ts, build-images-index.mjs),
+    so cards the UI sends and cards ingested here are recognized as one.
+    """
+    year, month = record.get("year"), record.get("month")
+    return f"givecase-{year or 'y'}{str('m' if month is None else month).zfill(2)}-{idx}"
+
+
+def case_card(record: dict, idx: int, analyze: Callable[[str, str], dict]) -> Optional[dict]:
+    """Map one case record to CardData fields; None for records without usable text."""
+    title = str(record.get("name") or "").strip()
+    description = str(record.get("content") or "").strip()
+    if not (title or description):
+        return None
+    # `name` is the contest, not the project: analyze the project description only
+    enriched = analyze("", description or title)
+    year, month = record.get("year"), record.get("month")
+    duration = f"{year}.{int(month):02d}" if year and isinstance(month, int) else (str(year) if year else None)
+    return {
+        "id": case_id(record, idx),
+        "imageUrl": "",
+        "category": enriched.get("suggestedCategory") or "",
+        "title": title,
+        "description": description,
+        "skills": list(enriched.get("skills") or []),
+        "duration": duration,
+        "contact": str(record.get("link") or "") or None,
+        "tags": list(enriched.get("tags") or []),
+        "matchingTags": list(enriched.get("matchingTags") or []),
+    }
+
+
+def ingest_cases(path: Path, analyze: Callable[[str, str], dict], *,
+                 limit: Optional[int] = None) -> Iterator[dict]:
+    """Stream card dicts for each usable record (up to `limit`). Ids use the record's
+    position in the file, as the frontend does.
+    """
+    count = 0
+    for idx, record in enumerate(iter_json_array(path)):
+        if limit is not None and count >= limit:
+            return
+        if not isinstance(record, dict):
+            continue
+        card = case_card(record, idx, analyze)
+        if card is None:
+            continue
+        count += 1
+        yield card
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stream a case file into give cards (JSON lines).")
+    parser.add_argument("--source", type=Path, default=DEFAULT_CASES, help="Case file (JSON array)")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after N cards")
+    args = parser.parse_args()
+
+    from main import analyze_case  # heavy import only for the CLI
+
+    for card in ingest_cases(args.source, analyze_case, limit=args.limit):
+        print(json.dumps(card, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Local category classifier: multinomial naive Bayes over word and character-bigram
+features, trained from the labeled cards in data/data.json and data/needs_cases.json.
+
+Shared by the API server (suggestions, heuristic /enrich) and corpus_artifact.py, which
+trains it offline and stores the fitted parameters in the artifact.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# (feature bag, label, weight)
+Doc = Tuple[Dict[str, int], str, float]
+
+
+def normalize_and_tokenize(text: str) -> List[str]:
+    lowered = text.lower()
+    lowered = re.sub(r"[^a-z0-9가-힣\s\-/]", "", lowered)
+    lowered = re.sub(r"[#\s]+", " ", lowered).strip()
+    if not lowered:
+        return []
+    parts = re.split(r"[\s/\-]+", lowered)
+    return [p for p in parts if len(p) >= 3]
+
+
+def char_ngrams(text: str, n: int = 2) -> set:
+    """Character n-grams per word; robust for short Korean terms that tokenization drops."""
+    grams = set()
+    for word in str(text).lower().replace("/", " ").replace("-", " ").split():
+        if len(word) < n:
+            grams.add(word)
+            continue
+        for i in range(len(word) - n + 1):
+            grams.add(word[i : i + n])
+    return grams
+
+
+def category_features(title: str = "", description: str = "", skills: Optional[List[str]] = None,
+                      tags: Optional[List[str]] = None) -> Dict[str, int]:
+    """Bag of normalize_and_tokenize words plus character bigrams; the bigrams keep the
+    short Korean words (2 syllables) that tokenization drops.
+    """
+    feats: Dict[str, int] = {}
+    for text in [title, description, *(skills or []), *(tags or [])]:
+        for tok in normalize_and_tokenize(text or ""):
+            feats["w:" + tok] = feats.get("w:" + tok, 0) + 1
+        for g in char_ngrams(text or ""):
+            feats["g:" + g] = feats.get("g:" + g, 0) + 1
+    return feats
+
+
+def category_pool_of(data: dict) -> List[str]:
+    cats = data.get("categories", {})
+    needs = cats.get("needsCategories", []) or []
+    gives = cats.get("givesCategories", []) or []
+    pool = list(dict.fromkeys([c for c in [*needs, *gives] if isinstance(c, str) and c.strip()]))
+    return pool
+
+
+def _is_all_category(name: str) -> bool:
+    n = (name or "").strip().lower()
+    return n in {"전체", "all"}
+
+
+def enrich_pool_of(pool: List[str]) -> List[str]:
+    filtered = [c for c in pool if not _is_all_category(str(c))]
+    return filtered or pool
+
+
+class CategoryClassifier:
+    """Multinomial naive Bayes over category_features with temperature-scaled posteriors.
+    Scores are computed sparsely: every class starts from prior + (feature count x its
+    unseen-feature log-prob), and only features seen with a class add a correction.
+
+    Parameters are indexed by class position: `bonus` maps a feature to its
+    [(class index, log((N_cf + alpha) / alpha))] pairs. Any read-only mapping and
+    sequences work (from_state), e.g. views over the corpus artifact's mmap.
+    """
+
+    def __init__(self, docs: List[Doc], *, alpha: float = 0.5, temperature: float = 1.0) -> None:
+        counts: Dict[str, Dict[str, float]] = {}
+        totals: Dict[str, float] = {}
+        weights: Dict[str, float] = {}
+        vocab = set()
+        for feats, label, w in docs:
+            c = counts.setdefault(label, {})
+            weights[label] = weights.get(label, 0.0) + w
+            for f, n in feats.items():
+                c[f] = c.get(f, 0.0) + n * w
+                totals[label] = totals.get(label, 0.0) + n * w
+                vocab.add(f)
+        self.temperature = temperature
+        self.classes: Sequence[str] = list(counts)
+        total_w = sum(weights.values()) or 1.0
+        v = max(1, len(vocab))
+        self.log_prior: Sequence[float] = [math.log(weights[c] / total_w) for c in self.classes]
+        self.log_unseen: Sequence[float] = [math.log(alpha / (totals.get(c, 0.0) + alpha * v))
+                                            for c in self.classes]
+        bonus: Dict[str, List[Tuple[int, float]]] = {}
+        for ci, cf in enumerate(counts.values()):
+            for f, n in cf.items():
+                bonus.setdefault(f, []).append((ci, math.log((n + alpha) / alpha)))
+        self.bonus: Mapping = bonus
+
+    def state(self) -> dict:
+        """Fitted parameters, as stored in the corpus artifact (see from_state)."""
+        return {
+            "classes": list(self.classes),
+            "log_prior": list(self.log_prior),
+            "log_unseen": list(self.log_unseen),
+            "temperature": self.temperature,
+            "bonus": {f: list(pairs) for f, pairs in self.bonus.items()},
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "CategoryClassifier":
+        """Wrap fitted parameters as-is (no copy)."""
+        clf = cls.__new__(cls)
+        clf.classes = state["classes"]
+        clf.log_prior = state["log_prior"]
+        clf.log_unseen = state["log_unseen"]
+        clf.temperature = state["temperature"]
+        clf.bonus = state["bonus"]
+        return clf
+
+    def log_score_matrix(self, batch: List[Dict[str, int]]) -> List[Optional[List[float]]]:
+        """Per-class log scores for every feature bag (None for bags with no known feature).
+        Each distinct feature in the batch is looked up once.
+        """
+        rows_of: Dict[str, Optional[list]] = {}
+        for feats in batch:
+            for f in feats:
+                if f not in rows_of:
+                    rows_of[f] = self.bonus.get(f)
+        matrix: List[Optional[List[float]]] = []
+        for feats in batch:
+            known = [(rows_of[f], n) for f, n in feats.items() if rows_of[f] is not None]
+            if not known:
+                matrix.append(None)
+                continue
+            size = sum(n for _, n in known)
+            row = [p + size * u for p, u in zip(self.log_prior, self.log_unseen)]
+            for pairs, n in known:
+                for ci, b in pairs:
+                    row[ci] += n * b
+            matrix.append(row)
+        return matrix
+
+    def _softmax(self, row: List[float], temperature: float) -> List[float]:
+        top = max(row)
+        exp = [math.exp((sc - top) / temperature) for sc in row]
+        z = sum(exp)
+        return [e / z for e in exp]
+
+    def predict_proba(self, feats: Dict[str, int], temperature: Optional[float] = None) -> Dict[str, float]:
+        row = self.log_score_matrix([feats])[0]
+        if row is None:
+            row = [p for p in self.log_prior]
+        return dict(zip(self.classes, self._softmax(row, temperature or self.temperature)))
+
+    def predict_batch(self, batch: List[Dict[str, int]]) -> List[Tuple[Optional[str], float]]:
+        """(category, calibrated confidence) per feature bag; (None, 0.0) without signal."""
+        out: List[Tuple[Optional[str], float]] = []
+        if not len(self.classes):
+            return [(None, 0.0)] * len(batch)
+        for row in self.log_score_matrix(batch):
+            if row is None:
+                out.append((None, 0.0))
+                continue
+            proba = self._softmax(row, self.temperature)
+            best = max(range(len(proba)), key=proba.__getitem__)
+            out.append((self.classes[best], round(proba[best], 4)))
+        return out
+
+
+def _labeled_category_docs(data: dict, extra_cards: List[dict], pool: List[str]) -> List[Doc]:
+    """Training docs from data.json cards plus `extra_cards` (needs_cases.json). A card's
+    label is its category when that is in the pool, else its pool-member tags (weight
+    split between them).
+    """
+    pool = set(pool)
+    cards: Dict[str, dict] = {}
+    for item in [*(data.get("needs") or []), *(data.get("gives") or []), *extra_cards]:
+        if isinstance(item, dict):
+            cards.setdefault(str(item.get("id")), item)
+
+    docs: List[Doc] = []
+    for item in cards.values():
+        cat = item.get("category")
+        labels = [cat] if cat in pool else [t for t in dict.fromkeys(item.get("tags") or []) if t in pool]
+        if not labels:
+            continue
+        feats = category_features(str(item.get("title") or ""), str(item.get("description") or ""),
+                                  [str(x) for x in item.get("skills") or []],
+                                  [str(x) for x in item.get("tags") or []])
+        for label in labels:
+            docs.append((feats, label, 1.0 / len(labels)))
+    return docs
+
+
+def _category_name_docs(pool: List[str]) -> List[Doc]:
+    return [(category_features(c), c, 1.0) for c in pool]
+
+
+def _fit_temperature(docs: List[Doc], extra: List[Doc], folds: int = 5) -> float:
+    """Pick the softmax temperature minimizing held-out NLL (k-fold over labeled cards;
+    `extra` docs are always trained on, never held out).
+    """
+    grid = [0.5, 1.0, 1.5, 2.0, 3.0, 5.0, 8.0, 12.0, 20.0]
+    nll = {t: 0.0 for t in grid}
+    seen = 0
+    for k in range(folds):
+        train = [d for i, d in enumerate(docs) if i % folds != k] + extra
+        held = [d for i, d in enumerate(docs) if i % folds == k]
+        if not train or not held:
+            continue
+        model = CategoryClassifier(train)
+        for feats, label, w in held:
+            if label not in model.classes:
+                continue
+            seen += 1
+            for t in grid:
+                p = model.predict_proba(feats, temperature=t).get(label, 0.0)
+                nll[t] -= w * math.log(max(p, 1e-9))
+    return min(grid, key=nll.get) if seen else 1.0
+
+
+def read_training_cards(path: Path) -> List[dict]:
+    """Cards from a JSON array file such as needs_cases.json; empty when missing/invalid."""
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return [item for item in json.load(f) or [] if isinstance(item, dict)]
+    except Exception:
+        return []
+
+
+def train_category_classifier(data: dict, extra_cards: List[dict]) -> Optional[CategoryClassifier]:
+    """Fit on data.json (+ needs_cases.json cards); None without labels. Run offline by
+    corpus_artifact.py build, or per process when no artifact is available.
+    """
+    pool = enrich_pool_of(category_pool_of(data))
+    docs = _labeled_category_docs(data, extra_cards, pool)
+    if not docs:
+        return None
+    # Each category name is a one-line doc so classes without labeled cards get some support
+    names = _category_name_docs(pool)
+    return CategoryClassifier(docs + names, temperature=_fit_temperature(docs, names))
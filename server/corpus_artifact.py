@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""Precompiled corpus artifact for the API server.
+
+The corpus-derived lookups the server needs are compiled offline from
+`data/data.json` into one binary file. Workers open it through a read-only mmap
+and answer lookups straight from its arrays, so the pages sit once in the OS page
+cache and are shared by every worker; only the strings a lookup returns are decoded.
+
+The category classifier is trained here too (category_classifier.py, on data.json
+plus the sibling needs_cases.json), so workers read its fitted counts instead of
+re-reading the training cards.
+
+Layout (little-endian):
+  magic b"ITDCORP1" | u32 header length | JSON header | sections (8-byte aligned)
+
+The JSON header holds the format version, the stamp (sha256 of data.json and
+needs_cases.json), their sizes and mtimes, and a table of sections
+{name: [offset, length, typecode]}. Sections:
+- str_offsets/str_data: interned UTF-8 string table; every other section refers to it by id
+- tag_vocab, skill_vocab, category_pool: string ids, in corpus order
+- tag_vocab_sorted, skill_vocab_sorted: vocab positions ordered by lookup key (lowercase
+  UTF-8), for exact lookups by binary search
+- {tag,skill}_grams (string ids, sorted) with CSR {tag,skill}_gram_ptr/_gram_postings
+  (vocab positions) and _gram_idf: the character-bigram index behind main.rank_vocab
+- clf_classes (string ids), clf_log_prior, clf_log_unseen (per class), clf_temperature
+- clf_features (string ids, sorted), clf_bonus_ptr/clf_bonus_class/clf_bonus_value: CSR
+  rows of (class index, log-count bonus) per feature; clf_classes is empty without labels
+
+Usage (from server/):
+  python3 corpus_artifact.py build            # data/data.json -> data/corpus.bin
+  python3 corpus_artifact.py info
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from category_classifier import category_pool_of, char_ngrams, read_training_cards, train_category_classifier
+
+MAGIC = b"ITDCORP1"
+FORMAT_VERSION = 4
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_SOURCE = HERE.parent / "data" / "data.json"
+DEFAULT_ARTIFACT = HERE / "data" / "corpus.bin"
+
+
+def needs_cases_path(source: Path) -> Path:
+    return source.parent / "needs_cases.json"
+
+
+def source_stats(source: Path) -> Dict[str, list]:
+    """[size, mtime_ns] of each stamped file; lets workers skip hashing unchanged files."""
+    stats = {}
+    for path in (source, needs_cases_path(source)):
+        if path.exists():
+            st = path.stat()
+            stats[path.name] = [st.st_size, st.st_mtime_ns]
+    return stats
+
+
+def source_stamp(source: Path) -> str:
+    """sha256 over data.json and, when present, needs_cases.json (classifier training data)."""
+    h = hashlib.sha256(source.read_bytes())
+    cases = needs_cases_path(source)
+    if cases.exists():
+        h.update(b"\0" + cases.read_bytes())
+    return h.hexdigest()
+
+
+# -------- Build ---------
+
+class _Interner:
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def __call__(self, s: str) -> int:
+        if s not in self.ids:
+            self.ids[s] = len(self.strings)
+            self.strings.append(s)
+        return self.ids[s]
+
+
+def _ordered_unique(values, key=lambda v: v) -> List[str]:
+    out, seen = [], set()
+    for v in values:
+        if v and key(v) not in seen:
+            seen.add(key(v))
+            out.append(v)
+    return out
+
+
+def _sorted_by_key(keys: List[str]) -> array:
+    """Positions ordered by the UTF-8 bytes of their keys (see _SortedIndex)."""
+    return array("I", sorted(range(len(keys)), key=lambda i: keys[i].encode("utf-8")))
+
+
+def _gram_sections(prefix: str, vocab: List[str], intern: "_Interner") -> Dict[str, array]:
+    """Character-bigram inverted index over `vocab`, as built by main._vocab_index."""
+    postings: Dict[str, List[int]] = {}
+    for i, entry in enumerate(vocab):
+        for g in char_ngrams(entry):
+            postings.setdefault(g, []).append(i)
+    total = max(1, len(vocab))
+    grams = sorted(postings, key=lambda g: g.encode("utf-8"))
+    sec = {
+        f"{prefix}_grams": array("I", map(intern, grams)),
+        f"{prefix}_gram_ptr": array("I", [0]),
+        f"{prefix}_gram_postings": array("I"),
+        f"{prefix}_gram_idf": array("d", (math.log(1.0 + total / len(postings[g])) for g in grams)),
+    }
+    for g in grams:
+        sec[f"{prefix}_gram_postings"].extend(postings[g])
+        sec[f"{prefix}_gram_ptr"].append(len(sec[f"{prefix}_gram_postings"]))
+    return sec
+
+
+def compile_corpus(data: dict, classifier: Optional[dict] = None) -> Dict[str, array]:
+    """Turn parsed data.json (and a CategoryClassifier.state()) into typed arrays; vocab
+    semantics match main.get_*_vocab.
+    """
+    intern = _Interner()
+    cards = [*(data.get("needs") or []), *(data.get("gives") or [])]
+
+    tags = _ordered_unique(str(t).strip().lower() for c in cards for t in (c.get("tags") or []))
+    skills = _ordered_unique((str(s).strip() for c in cards for s in (c.get("skills") or [])),
+                             key=str.lower)
+
+    sec: Dict[str, array] = {
+        "tag_vocab": array("I", map(intern, tags)),
+        "tag_vocab_sorted": _sorted_by_key(tags),
+        "skill_vocab": array("I", map(intern, skills)),
+        "skill_vocab_sorted": _sorted_by_key([s.lower() for s in skills]),
+        "category_pool": array("I", map(intern, category_pool_of(data))),
+        **_gram_sections("tag", tags, intern),
+        **_gram_sections("skill", skills, intern),
+        "clf_classes": array("I"),
+        "clf_log_prior": array("d"),
+        "clf_log_unseen": array("d"),
+        "clf_temperature": array("d", [1.0]),
+        "clf_features": array("I"),
+        "clf_bonus_ptr": array("I", [0]),
+        "clf_bonus_class": array("I"),
+        "clf_bonus_value": array("d"),
+    }
+    if classifier is not None:
+        sec["clf_classes"].extend(map(intern, classifier["classes"]))
+        sec["clf_log_prior"].extend(classifier["log_prior"])
+        sec["clf_log_unseen"].extend(classifier["log_unseen"])
+        sec["clf_temperature"][0] = classifier["temperature"]
+        bonus = classifier["bonus"]
+        for feature in sorted(bonus, key=lambda f: f.encode("utf-8")):
+            sec["clf_features"].append(intern(feature))
+            for ci, value in bonus[feature]:
+                sec["clf_bonus_class"].append(ci)
+                sec["clf_bonus_value"].append(value)
+            sec["clf_bonus_ptr"].append(len(sec["clf_bonus_class"]))
+
+    encoded = [s.encode("utf-8") for s in intern.strings]
+    offsets = array("I", [0])
+    for b in encoded:
+        offsets.append(offsets[-1] + len(b))
+    sec["str_offsets"] = offsets
+    sec["str_data"] = array("B", b"".join(encoded))
+    return sec
+
+
+def write_artifact(sections: Dict[str, array], stamp: str, path: Path,
+                   sources: Optional[Dict[str, list]] = None) -> None:
+    """Serialize sections behind a JSON header; written to a temp file and renamed."""
+    names = sorted(sections)
+
+    def header_bytes(table: dict) -> bytes:
+        return json.dumps({"format": FORMAT_VERSION, "stamp": stamp, "sources": sources or {},
+                           "sections": table}, separators=(",", ":")).encode("utf-8")
+
+    # Section offsets depend on the header length, which depends on the offsets: iterate to a fixpoint
+    table: Dict[str, list] = {n: [0, 0, sections[n].typecode] for n in names}
+    header = header_bytes(table)
+    while True:
+        offset = len(MAGIC) + 4 + len(header)
+        for n in names:
+            offset += -offset % 8
+            length = len(sections[n]) * sections[n].itemsize
+            table[n] = [offset, length, sections[n].typecode]
+            offset += length
+        new_header = header_bytes(table)
+        if len(new_header) == len(header):
+            header = new_header
+            break
+        header = new_header
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(header)) + header)
+        for n in names:
+            f.write(b"\0" * (table[n][0] - f.tell()))
+            f.write(sections[n].tobytes())
+    tmp.replace(path)
+
+
+def build(source: Path = DEFAULT_SOURCE, artifact: Path = DEFAULT_ARTIFACT) -> Path:
+    data = json.loads(source.read_text(encoding="utf-8"))
+    clf = train_category_classifier(data, read_training_cards(needs_cases_path(source)))
+    write_artifact(compile_corpus(data, clf.state() if clf is not None else None), source_stamp(source), artifact,
+                   source_stats(source))
+    return artifact
+
+
+# -------- Read ---------
+
+class StringColumn(Sequence):
+    """Read-only sequence of strings over a section of string ids; decodes on access.
+    With a sorted index, find() looks an entry up by key without scanning.
+    """
+
+    def __init__(self, art: "CorpusArtifact", ids: memoryview, index: Optional["_SortedIndex"] = None) -> None:
+        self._art = art
+        self._ids = ids
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._art.string(sid) for sid in self._ids[i]]
+        return self._art.string(self._ids[i])
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self._art.string, self._ids)
+
+    @property
+    def indexed(self) -> bool:
+        return self._index is not None
+
+    def find(self, key: str) -> Optional[int]:
+        """Position of the entry whose lookup key equals `key`, or None."""
+        if self._index is None:
+            raise TypeError("column has no lookup index")
+        return self._index.find(key)
+
+
+class _SortedIndex:
+    """Binary search over rows whose keys are string ids ordered by UTF-8 bytes (of the
+    lowercase string with `lower`). `order` maps sorted rank -> row (None: rows are
+    already in key order).
+    """
+
+    def __init__(self, art: "CorpusArtifact", key_ids: memoryview, order: Optional[memoryview] = None,
+                 *, lower: bool = False) -> None:
+        self._art = art
+        self._key_ids = key_ids
+        self._order = order
+        self._lower = lower
+
+    def _key(self, row: int) -> bytes:
+        if self._lower:
+            return self._art.string(self._key_ids[row]).lower().encode("utf-8")
+        return self._art.string_bytes(self._key_ids[row])
+
+    def find(self, key: str) -> Optional[int]:
+        target = key.encode("utf-8")
+        lo, hi = 0, len(self._key_ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            row = self._order[mid] if self._order is not None else mid
+            probe = self._key(row)
+            if probe < target:
+                lo = mid + 1
+            elif probe > target:
+                hi = mid
+            else:
+                return row
+        return None
+
+
+class GramIndex(Mapping):
+    """n-gram -> (idf, vocab positions) over the mmapped CSR index."""
+
+    def __init__(self, art: "CorpusArtifact", prefix: str) -> None:
+        self._grams = art.section(f"{prefix}_grams")
+        self._index = _SortedIndex(art, self._grams)
+        self._ptr = art.section(f"{prefix}_gram_ptr")
+        self._postings = art.section(f"{prefix}_gram_postings")
+        self._idf = art.section(f"{prefix}_gram_idf")
+        self._art = art
+
+    def __getitem__(self, gram: str) -> Tuple[float, memoryview]:
+        row = self._index.find(gram)
+        if row is None:
+            raise KeyError(gram)
+        return self._idf[row], self._postings[self._ptr[row] : self._ptr[row + 1]]
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self._art.string, self._grams)
+
+    def __len__(self) -> int:
+        return len(self._grams)
+
+
+class ClassifierBonus(Mapping):
+    """feature -> [(class index, bonus)] over the mmapped CSR rows (CategoryClassifier.bonus)."""
+
+    def __init__(self, art: "CorpusArtifact") -> None:
+        self._features = art.section("clf_features")
+        self._index = _SortedIndex(art, self._features)
+        self._ptr = art.section("clf_bonus_ptr")
+        self._cls = art.section("clf_bonus_class")
+        self._val = art.section("clf_bonus_value")
+        self._art = art
+
+    def __getitem__(self, feature: str) -> List[Tuple[int, float]]:
+        row = self._index.find(feature)
+        if row is None:
+            raise KeyError(feature)
+        a, b = self._ptr[row], self._ptr[row + 1]
+        return list(zip(self._cls[a:b], self._val[a:b]))
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self._art.string, self._features)
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+
+class CorpusArtifact:
+    """Read-only view over an mmapped artifact. Arrays are zero-copy memoryviews;
+    strings are decoded on access.
+    """
+
+    def __init__(self, path: Path) -> None:
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a corpus artifact")
+        (hlen,) = struct.unpack_from("<I", self._mm, len(MAGIC))
+        start = len(MAGIC) + 4
+        self.header = json.loads(self._mm[start : start + hlen])
+        self.stamp: str = self.header.get("stamp", "")
+        view = memoryview(self._mm)
+        self._sec = {
+            name: view[off : off + length].cast(typecode)
+            for name, (off, length, typecode) in self.header["sections"].items()
+        }
+        self._str_off = self._sec["str_offsets"]
+        self._str_data = self._sec["str_data"]
+
+    def section(self, name: str) -> memoryview:
+        return self._sec[name]
+
+    def string_bytes(self, sid: int) -> bytes:
+        return self._str_data[self._str_off[sid] : self._str_off[sid + 1]].tobytes()
+
+    def string(self, sid: int) -> str:
+        return self.string_bytes(sid).decode("utf-8")
+
+    # Vocabulary / pools (same order and casing as the JSON-derived versions)
+    def tag_vocab(self) -> StringColumn:
+        """Lowercase tags; find() takes the tag itself."""
+        return StringColumn(self, self._sec["tag_vocab"],
+                            _SortedIndex(self, self._sec["tag_vocab"], self._sec["tag_vocab_sorted"]))
+
+    def skill_vocab(self) -> StringColumn:
+        """Skills as first spelled; find() takes the lowercase skill."""
+        return StringColumn(self, self._sec["skill_vocab"],
+                            _SortedIndex(self, self._sec["skill_vocab"], self._sec["skill_vocab_sorted"],
+                                         lower=True))
+
+    def category_pool(self) -> StringColumn:
+        return StringColumn(self, self._sec["category_pool"])
+
+    def gram_index(self, kind: str) -> GramIndex:
+        """Bigram index over the tag ("tags") or skill ("skills") vocabulary."""
+        return GramIndex(self, "tag" if kind == "tags" else "skill")
+
+    def classifier_state(self) -> Optional[dict]:
+        """CategoryClassifier.state() as compiled at build time, over the mmap (no copy);
+        None without labels.
+        """
+        classes = StringColumn(self, self._sec["clf_classes"])
+        if not len(classes):
+            return None
+        return {
+            "classes": classes,
+            "log_prior": self._sec["clf_log_prior"],
+            "log_unseen": self._sec["clf_log_unseen"],
+            "temperature": self._sec["clf_temperature"][0],
+            "bonus": ClassifierBonus(self),
+        }
+
+
+def open_artifact(path: Path, source: Path) -> Optional[CorpusArtifact]:
+    """Open the artifact if it exists and was built from the current source; else None.
+    Files whose size and mtime match the build are trusted without re-hashing them.
+    """
+    try:
+        if not path.exists() or not source.exists():
+            return None
+        art = CorpusArtifact(path)
+    except Exception:
+        return None
+    if art.header.get("format") != FORMAT_VERSION:
+        return None
+    if art.header.get("sources") != source_stats(source) and art.stamp != source_stamp(source):
+        return None
+    return art
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compile data.json into an mmap-able corpus artifact.")
+    parser.add_argument("command", choices=["build", "info"])
+    parser.add_argument("--source", type=Path, default=DEFAULT_SOURCE, help="Input data.json")
+    parser.add_argument("--out", type=Path, default=DEFAULT_ARTIFACT, help="Artifact path")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        path = build(args.source, args.out)
+        print(f"Wrote {path} ({path.stat().st_size} bytes)")
+        return
+    art = open_artifact(args.out, args.source)
+    if art is None:
+        sys.exit(f"{args.out} is missing or stale for {args.source}; run: python3 corpus_artifact.py build")
+    print(json.dumps({
+        "stamp": art.stamp,
+        "tags": len(art.section("tag_vocab")),
+        "skills": len(art.section("skill_vocab")),
+        "categories": len(art.section("category_pool")),
+        "classifier_features": len(art.section("clf_features")),
+    }))
+
+
+if __name__ == "__main__":
+    main()
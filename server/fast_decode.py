@@ -0,0 +1,229 @@
+"""Fast-path decoding of /match request bodies.
+
+MatchRequest validation builds a full pydantic CardData for every card, including
+fields matching never reads (imageUrl, duration, contact, llmCategory). This decoder
+parses the JSON once (orjson when installed) and keeps only the fields matching uses,
+in slotted records that duck-type CardData for prefilter_pairs, scoring and category
+suggestions. Every field is still validated as MatchRequest would (required keys,
+strings, lists of strings, pydantic's lax int/bool coercion for top_k/includeCases),
+so /match/fast accepts and rejects the same bodies as /match; errors use the
+pydantic/FastAPI shape so the route answers 422 the same way.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import List, Optional
+
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None
+
+
+class DecodeError(ValueError):
+    def __init__(self, errors: List[dict]) -> None:
+        super().__init__(f"{len(errors)} validation error(s)")
+        self.errors = errors
+
+
+class LiteCard:
+    """The CardData fields matching reads. The others are validated, then dropped."""
+
+    __slots__ = ("id", "category", "title", "description", "skills", "tags", "matchingTags", "llmTags")
+
+    def __init__(self, id: str, category: str, title: str, description: str, skills: List[str],
+                 tags: List[str], matchingTags: List[str], llmTags: Optional[List[str]] = None) -> None:
+        self.id = id
+        self.category = category
+        self.title = title
+        self.description = description
+        self.skills = skills
+        self.tags = tags
+        self.matchingTags = matchingTags
+        self.llmTags = llmTags
+
+    def as_card(self) -> dict:
+        """CardData-shaped dict (skipped fields empty), e.g. to forward to a shard."""
+        return {"id": self.id, "imageUrl": "", "category": self.category, "title": self.title,
+                "description": self.description, "skills": self.skills, "tags": self.tags,
+                "matchingTags": self.matchingTags, "llmTags": self.llmTags}
+
+
+class LiteMatchRequest:
+    __slots__ = ("needs", "gives", "top_k", "includeCases")
+
+    def __init__(self, needs: List[LiteCard], gives: List[LiteCard], top_k: int = 5,
+                 includeCases: bool = False) -> None:
+        self.needs = needs
+        self.gives = gives
+        self.top_k = top_k
+        self.includeCases = includeCases
+
+
+# CardData's fields in declaration order (errors are reported in this order), with their
+# kind: required str, required list of str, optional str, optional list of str
+_CARD_FIELDS = (
+    ("id", "str"), ("imageUrl", "str"), ("category", "str"), ("title", "str"), ("description", "str"),
+    ("skills", "list"), ("duration", "opt_str"), ("contact", "opt_str"), ("tags", "list"),
+    ("matchingTags", "list"), ("llmCategory", "opt_str"), ("llmTags", "opt_list"),
+)
+# Validated like CardData but not kept
+_DROPPED_FIELDS = {"imageUrl", "duration", "contact", "llmCategory"}
+
+# What pydantic's lax int accepts from a string: digits with single underscores, optional ".0"
+_INT_STR = re.compile(r"[+-]?[0-9]+(?:_[0-9]+)*(?:\.0+)?", re.ASCII)
+_TRUE_STRS = {"1", "on", "t", "true", "y", "yes"}
+_FALSE_STRS = {"0", "off", "f", "false", "n", "no"}
+_NOT_OBJECT = "Input should be a valid dictionary or object to extract fields from"
+
+
+def _error(loc: tuple, kind: str, msg: str, value) -> dict:
+    return {"type": kind, "loc": ["body", *loc], "msg": msg, "input": value}
+
+
+def _str_list(value, loc: tuple, errors: List[dict]) -> List[str]:
+    if not isinstance(value, list):
+        errors.append(_error(loc, "list_type", "Input should be a valid list", value))
+        return []
+    for i, v in enumerate(value):
+        if not isinstance(v, str):
+            errors.append(_error((*loc, i), "string_type", "Input should be a valid string", v))
+    return value
+
+
+def _strs(values) -> bool:
+    return type(values) is list and all(type(v) is str for v in values)
+
+
+def _lax_int(value, loc: tuple, errors: List[dict]) -> Optional[int]:
+    """int as pydantic validates it from JSON in lax mode (bools, integral floats and
+    numeric strings such as "5" are coerced)."""
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float):
+        if not value.is_integer():
+            errors.append(_error(loc, "int_from_float",
+                                 "Input should be a valid integer, got a number with a fractional part", value))
+        elif abs(value) >= 2 ** 63:
+            errors.append(_error(loc, "int_parsing_size",
+                                 "Unable to parse input string as an integer, exceeded maximum size", value))
+        else:
+            return int(value)
+        return None
+    if isinstance(value, str):
+        text = value.strip()
+        if _INT_STR.fullmatch(text):
+            return int(text.split(".")[0])
+        errors.append(_error(loc, "int_parsing",
+                             "Input should be a valid integer, unable to parse string as an integer", value))
+        return None
+    errors.append(_error(loc, "int_type", "Input should be a valid integer", value))
+    return None
+
+
+def _lax_bool(value, loc: tuple, errors: List[dict]) -> Optional[bool]:
+    """bool as pydantic validates it from JSON in lax mode (0/1 and "yes"/"off"-style strings)."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.lower() in _TRUE_STRS | _FALSE_STRS:
+        return value.lower() in _TRUE_STRS
+    if (isinstance(value, str) or (isinstance(value, int) and -2 ** 63 <= value < 2 ** 63)
+            or (isinstance(value, float) and value.is_integer() and abs(value) < 2 ** 63)):
+        errors.append(_error(loc, "bool_parsing", "Input should be a valid boolean, unable to interpret input", value))
+    else:
+        errors.append(_error(loc, "bool_type", "Input should be a valid boolean", value))
+    return None
+
+
+def decode_card(obj, loc: tuple, errors: List[dict]) -> Optional[LiteCard]:
+    # Common case first: a well-formed card passes with plain type checks and no error bookkeeping
+    if type(obj) is dict:
+        get = obj.get
+        id, category, title, description = get("id"), get("category"), get("title"), get("description")
+        skills, tags, matching, llm_tags = get("skills"), get("tags"), get("matchingTags"), get("llmTags")
+        duration, contact, llm_category = get("duration"), get("contact"), get("llmCategory")
+        if (type(id) is str and type(category) is str and type(title) is str and type(description) is str
+                and type(get("imageUrl")) is str
+                and (duration is None or type(duration) is str) and (contact is None or type(contact) is str)
+                and (llm_category is None or type(llm_category) is str)
+                and _strs(skills) and _strs(tags) and _strs(matching) and (llm_tags is None or _strs(llm_tags))):
+            return LiteCard(id, category, title, description, skills, tags, matching, llm_tags)
+    return _decode_card_checked(obj, loc, errors)
+
+
+def _decode_card_checked(obj, loc: tuple, errors: List[dict]) -> Optional[LiteCard]:
+    """Field-by-field validation that reports every problem."""
+    if not isinstance(obj, dict):
+        errors.append(_error(loc, "model_attributes_type", _NOT_OBJECT, obj))
+        return None
+    before = len(errors)
+    values = {}
+    for name, kind in _CARD_FIELDS:
+        value = obj.get(name)
+        if name not in obj:
+            if kind in ("str", "list"):
+                errors.append(_error((*loc, name), "missing", "Field required", obj))
+            continue
+        if value is None and kind.startswith("opt_"):
+            continue
+        if kind.endswith("list"):
+            value = _str_list(value, (*loc, name), errors)
+        elif not isinstance(value, str):
+            errors.append(_error((*loc, name), "string_type", "Input should be a valid string", value))
+            continue
+        if name not in _DROPPED_FIELDS:
+            values[name] = value
+    if len(errors) > before:
+        return None
+    return LiteCard(**values)
+
+
+def _parse(body: bytes):
+    """orjson when installed, else the stdlib parser. Bodies orjson rejects, or where it turned
+    a top_k/includeCases integer beyond 64 bits into a float, are re-read with the stdlib
+    parser so errors and coercion match /match exactly."""
+    if orjson is None:
+        return json.loads(body)
+    try:
+        data = orjson.loads(body)
+    except ValueError:
+        return json.loads(body)  # /match reports the stdlib parser's error
+    if isinstance(data, dict) and any(isinstance(data.get(k), float) and abs(data[k]) >= 2 ** 63
+                                      for k in ("top_k", "includeCases")):
+        return json.loads(body)
+    return data
+
+
+def decode_match_request(body: bytes) -> LiteMatchRequest:
+    """Parse and validate a MatchRequest JSON body; raises DecodeError listing every problem."""
+    try:
+        data = _parse(body) if body else None
+    except json.JSONDecodeError as e:
+        err = _error((e.pos,), "json_invalid", "JSON decode error", {})
+        raise DecodeError([{**err, "ctx": {"error": e.msg}}])
+    except ValueError as e:
+        raise DecodeError([_error((), "json_invalid", f"JSON decode error: {e}", {})])
+    if data is None:
+        raise DecodeError([_error((), "missing", "Field required", None)])
+    if not isinstance(data, dict):
+        raise DecodeError([_error((), "model_attributes_type", _NOT_OBJECT, data)])
+
+    errors: List[dict] = []
+    sides = {}
+    for side in ("needs", "gives"):
+        items = data.get(side)
+        if side not in data:
+            errors.append(_error((side,), "missing", "Field required", data))
+        elif not isinstance(items, list):
+            errors.append(_error((side,), "list_type", "Input should be a valid list", items))
+        else:
+            sides[side] = [decode_card(obj, (side, i), errors) for i, obj in enumerate(items)]
+    top_k = _lax_int(data.get("top_k", 5), ("top_k",), errors)
+    include_cases = _lax_bool(data.get("includeCases", False), ("includeCases",), errors)
+    if errors:
+        raise DecodeError(errors)
+    return LiteMatchRequest(sides["needs"], sides["gives"], top_k, include_cases)
@@ -1,27 +1,53 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import os
+import sqlite3
+import time
+from collections import deque
+from collections.abc import Mapping, Sequence
+from contextlib import asynccontextmanager
 from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-# Optional LLM
+from case_ingest import DEFAULT_CASES, ingest_cases
+from category_classifier import (
+    CategoryClassifier,
+    category_features,
+    category_pool_of,
+    char_ngrams,
+    enrich_pool_of,
+    normalize_and_tokenize,
+    read_training_cards,
+    train_category_classifier,
+)
+from corpus_artifact import DEFAULT_ARTIFACT, open_artifact
+from fast_decode import DecodeError, LiteCard, decode_match_request
+
+# Optional LLM: langchain_openai is heavy, so it is imported on first use (see chat_openai_class)
+
+# Optional fast JSON encoder for compact responses
 try:
-    from langchain_openai import ChatOpenAI
+    import orjson
 except Exception:  # pragma: no cover
-    ChatOpenAI = None  # type: ignore
+    orjson = None  # type: ignore
 
 ROOT = Path(__file__).resolve().parent
 REPO_ROOT = ROOT.parent
 FRONT_DATA = REPO_ROOT / "data" / "data.json"
 STORE_PATH = ROOT / "data" / "matches.json"
+# Indexed copy of STORE_PATH used for paginated/filtered reads
+STORE_DB = ROOT / "data" / "matches.sqlite3"
 
 
 class Settings(BaseSettings):
@@ -40,6 +66,38 @@ class Settings(BaseSettings):
     ])
     openai_api_key: Optional[str] = Field(default=None)
     openai_model: str = Field(default="gpt-4o-mini")
+    # LLM latency guards (seconds). A call that misses its deadline degrades to the heuristic.
+    llm_call_timeout: float = Field(default=8.0)
+    llm_request_budget: float = Field(default=20.0)
+    # Start a duplicate call when the first has not answered after this many seconds (0 = off)
+    llm_hedge_delay: float = Field(default=0.0)
+    # Circuit breaker: open when failures/slow calls exceed the ratio over the last `window` calls
+    llm_breaker_window: int = Field(default=50)
+    llm_breaker_min_calls: int = Field(default=10)
+    llm_breaker_failure_ratio: float = Field(default=0.5)
+    llm_breaker_slow_call: float = Field(default=5.0)
+    llm_breaker_cooldown: float = Field(default=30.0)
+    # Compiled corpus (corpus_artifact.py build); ignored when missing or stale
+    corpus_artifact: Optional[str] = Field(default=None)
+    # Heuristic /enrich takes the local classifier's category at or above this confidence
+    classifier_min_confidence: float = Field(default=0.35)
+    # Async /match/jobs: concurrent jobs, queued jobs before 429, seconds finished results are kept
+    match_jobs_workers: int = Field(default=2)
+    match_jobs_queue_size: int = Field(default=20)
+    match_jobs_ttl: float = Field(default=600.0)
+    # Give cards ingested from data/gives_cases.json for `includeCases` matching
+    case_gives_path: Optional[str] = None
+    case_gives_max: int = Field(default=5000)
+    # Scatter-gather: as coordinator, shard base URLs (JSON list or comma-separated; empty =
+    # match locally). A str, resolved by resolve_match_shards, like CORS_ORIGINS.
+    match_shards: Optional[str] = None
+    # Per phase; default LLM_REQUEST_BUDGET + 5 so shards scoring with the LLM can finish
+    match_shard_timeout: Optional[float] = None
+    # As shard: this node's partition of the case corpus (shard_count > 1 keeps only its part)
+    shard_index: int = Field(default=0)
+    shard_count: int = Field(default=1)
+    # How many relevance-ranked tags/skills to embed in each /enrich prompt
+    enrich_vocab_top_n: int = Field(default=30)
 
 def resolve_cors_origins(defaults: List[str]) -> List[str]:
     """Resolve CORS origins from env with robust fallbacks.
@@ -59,6 +117,19 @@ def resolve_cors_origins(defaults: List[str]) -> List[str]:
     return [s.strip() for s in val.split(",") if s.strip()]
 
 
+def resolve_match_shards(value: Optional[str]) -> List[str]:
+    """Shard base URLs from MATCH_SHARDS: a JSON array or a comma-separated string."""
+    if not value:
+        return []
+    try:
+        data = json.loads(value)
+        if isinstance(data, list):
+            return [str(s).strip() for s in data if str(s).strip()]
+    except Exception:
+        pass
+    return [s.strip() for s in value.split(",") if s.strip()]
+
+
 @lru_cache
 def get_settings() -> Settings:
     return Settings()
@@ -95,6 +166,25 @@ class MatchRequest(BaseModel):
     needs: List[CardData]
     gives: List[CardData]
     top_k: int = 5
+    # Also match needs against the give cards ingested from the case corpus
+    includeCases: bool = False
+
+
+class ShardMatchRequest(MatchRequest):
+    # Sent by the coordinator: `gives` is already this shard's partition
+    shard: int = 0
+    shards: int = 1
+
+
+class ShardScoreRequest(BaseModel):
+    # Phase 2 of scatter-gather: score these (need id -> give ids) pairs; case gives are
+    # resolved from this shard's case corpus, so `gives` holds only request cards
+    needs: List[CardData]
+    gives: List[CardData]
+    pairs: Dict[str, List[str]]
+    includeCases: bool = False
+    shard: int = 0
+    shards: int = 1
 
 
 class MatchResponse(BaseModel):
@@ -103,6 +193,24 @@ class MatchResponse(BaseModel):
     categorySuggestions: List[CategorySuggestion]
 
 
+class MatchDeltaRequest(BaseModel):
+    """Incremental re-match: the previous result plus the current boards.
+    Unchanged cards are still sent (shortlists depend on every card's tags) but are not
+    re-scored. Added/removed cards are detected against `previous`; edited cards must be
+    listed in changedIds.
+    """
+    previous: MatchResponse
+    needs: List[CardData]
+    gives: List[CardData]
+    changedIds: List[str] = []
+    top_k: int = 5
+
+
+class MatchPage(MatchResponse):
+    # Opaque cursor for the next page of entities; None when this is the last page
+    nextCursor: Optional[str] = None
+
+
 class CategoriesResponse(BaseModel):
     needsCategories: List[str]
     givesCategories: List[str]
@@ -122,12 +230,77 @@ class EnrichResponse(BaseModel):
     confidence: float = 0.0
 
 
-app = FastAPI(title="LLM Matching API", version="0.1.0")
+@lru_cache
+def chat_openai_class():
+    """langchain_openai.ChatOpenAI, imported on first use; None when not installed."""
+    try:
+        from langchain_openai import ChatOpenAI
+    except Exception:  # pragma: no cover
+        return None
+    return ChatOpenAI
+
+
+def llm_configured() -> bool:
+    """API key present and langchain_openai installed (checked without importing it)."""
+    if not settings.openai_api_key:
+        return False
+    from importlib.util import find_spec
+    return find_spec("langchain_openai") is not None
+
+
+# Startup state for /ready: corpus caches are warmed in the background after boot
+warmup_state: Dict[str, object] = {"ready": False, "seconds": None, "error": None}
+
+
+def warm_caches() -> float:
+    """Fill every corpus-derived cache (and import the LLM client when configured).
+    Returns elapsed seconds.
+    """
+    start = time.perf_counter()
+    if get_corpus_artifact() is None:
+        _load_front_json()
+    get_category_pool()
+    get_enrich_category_pool()
+    get_tag_vocab()
+    get_skill_vocab()
+    _vocab_index("tags")
+    _vocab_index("skills")
+    _enrich_prompt_prefix()
+    get_category_classifier()
+    get_case_gives()
+    if llm_configured():
+        chat_openai_class()
+    return time.perf_counter() - start
+
+
+async def _run_warmup() -> None:
+    try:
+        warmup_state["seconds"] = round(await asyncio.to_thread(warm_caches), 4)
+    except Exception as e:  # pragma: no cover
+        # Caches still fill lazily on first use; report but stay ready
+        warmup_state["error"] = str(e)
+    warmup_state["ready"] = True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm in the background so the port opens (and /health answers) immediately
+    task = asyncio.create_task(_run_warmup())
+    match_jobs.start()
+    yield
+    task.cancel()
+    await match_jobs.stop()
+    if get_shard_client.cache_info().currsize:
+        await get_shard_client().aclose()
+
+
+app = FastAPI(title="LLM Matching API", version="0.1.0", lifespan=lifespan)
 
 
 # CORS
 settings = get_settings()
 resolved_origins = resolve_cors_origins(settings.default_cors_origins)
+match_shard_urls = resolve_match_shards(settings.match_shards)
 cors_kwargs = dict(
     allow_credentials=True,
     allow_methods=["*"],
@@ -168,16 +341,6 @@ def gather_tags(card: CardData) -> List[str]:
                 out.append(t)
     return out
 
-def normalize_and_tokenize(text: str) -> List[str]:
-    import re
-    lowered = text.lower()
-    lowered = re.sub(r"[^a-z0-9가-힣\s\-/]", "", lowered)
-    lowered = re.sub(r"[#\s]+", " ", lowered).strip()
-    if not lowered:
-        return []
-    parts = re.split(r"[\s/\-]+", lowered)
-    return [p for p in parts if len(p) >= 3]
-
 
 # ----- Corpus-aware normalization helpers -----
 
@@ -201,67 +364,110 @@ def _load_front_json() -> dict:
                 data["categories"]["needsCategories"] = list({
                     n.get("category", "") for n in (needs or []) if isinstance(n, dict) and n.get("category")
                 })
-            gives_path = REPO_ROOT / "data" / "gives_cases.json"
-            if gives_path.exists():
-                # gives have no tags/skills, keep empty but present
-                data["gives"] = []
+            # gives_cases.json has no tags/skills; it is matched through get_case_gives() instead
         except Exception:
             pass
         return data
 
 @lru_cache
-def get_category_pool() -> List[str]:
-    data = _load_front_json()
-    cats = data.get("categories", {})
-    needs = cats.get("needsCategories", []) or []
-    gives = cats.get("givesCategories", []) or []
-    pool = list(dict.fromkeys([c for c in [*needs, *gives] if isinstance(c, str) and c.strip()]))
-    return pool
+def get_corpus_artifact():
+    """Precompiled corpus artifact (parse cache), or None when missing/stale, in which
+    case the helpers below derive everything from data.json.
+    """
+    path = Path(settings.corpus_artifact) if settings.corpus_artifact else DEFAULT_ARTIFACT
+    return open_artifact(path, FRONT_DATA)
 
-def _is_all_category(name: str) -> bool:
-    n = (name or "").strip().lower()
-    return n in {"전체", "all"}
+@lru_cache
+def get_category_pool() -> Sequence[str]:
+    art = get_corpus_artifact()
+    if art is not None:
+        return art.category_pool()
+    return category_pool_of(_load_front_json())
 
 @lru_cache
 def get_enrich_category_pool() -> List[str]:
     """Category pool for enrich: exclude the catch-all entry like '전체'.
     Never return empty; if filtering removes everything, fall back to original pool.
     """
-    pool = get_category_pool()
-    filtered = [c for c in pool if not _is_all_category(str(c))]
-    return filtered or pool
+    return enrich_pool_of(get_category_pool())
 
 @lru_cache
-def get_tag_vocab() -> List[str]:
+def get_tag_vocab() -> Sequence[str]:
+    art = get_corpus_artifact()
+    if art is not None:
+        return art.tag_vocab()
     data = _load_front_json()
     vocab = []
+    seen = set()
     for coll in [data.get("needs", []), data.get("gives", [])]:
         for item in coll or []:
             for t in (item.get("tags") or []):
                 tt = str(t).strip().lower()
-                if tt and tt not in vocab:
+                if tt and tt not in seen:
+                    seen.add(tt)
                     vocab.append(tt)
     return vocab
 
 @lru_cache
-def get_skill_vocab() -> List[str]:
+def get_skill_vocab() -> Sequence[str]:
+    art = get_corpus_artifact()
+    if art is not None:
+        return art.skill_vocab()
     data = _load_front_json()
     vocab = []
+    seen = set()
     for coll in [data.get("needs", []), data.get("gives", [])]:
         for item in coll or []:
             for s in (item.get("skills") or []):
                 ss = str(s).strip()
-                if ss and ss.lower() not in {v.lower() for v in vocab}:
+                if ss and ss.lower() not in seen:
+                    seen.add(ss.lower())
                     vocab.append(ss)
     return vocab
 
+@lru_cache
+def _vocab_index(kind: str) -> Tuple[Sequence[str], Mapping]:
+    """Inverted n-gram index over the tag or skill vocabulary: (entries, gram -> (idf, entry ids)).
+    Served from the corpus artifact's mmap when available.
+    """
+    import math
+    art = get_corpus_artifact()
+    if art is not None:
+        return (art.tag_vocab() if kind == "tags" else art.skill_vocab()), art.gram_index(kind)
+    vocab = get_tag_vocab() if kind == "tags" else get_skill_vocab()
+    postings: Dict[str, List[int]] = {}
+    for i, entry in enumerate(vocab):
+        for g in char_ngrams(entry):
+            postings.setdefault(g, []).append(i)
+    total = max(1, len(vocab))
+    return vocab, {g: (math.log(1.0 + total / len(ids)), ids) for g, ids in postings.items()}
+
+def rank_vocab(kind: str, text: str, top_n: int) -> List[str]:
+    """Return up to top_n vocabulary entries most relevant to text (idf-weighted n-gram overlap).
+    Falls back to vocabulary order when nothing overlaps, so the prompt never loses its hints.
+    """
+    vocab, grams = _vocab_index(kind)
+    scores: Dict[int, float] = {}
+    for g in char_ngrams(text):
+        hit = grams.get(g)
+        if hit is None:
+            continue
+        w, ids = hit
+        for i in ids:
+            scores[i] = scores.get(i, 0.0) + w
+    ranked = sorted(scores, key=lambda i: (-scores[i], i))[:top_n]
+    if len(ranked) < top_n:
+        seen = set(ranked)
+        ranked += [i for i in range(len(vocab)) if i not in seen][: top_n - len(ranked)]
+    return [vocab[i] for i in ranked]
+
 def _title_case(s: str) -> str:
     try:
         return " ".join([w.capitalize() for w in s.split()])
     except Exception:
         return s
 
-def snap_one(value: Optional[str], choices: List[str], *, case_insensitive=True, cutoff=0.8) -> Optional[str]:
+def snap_one(value: Optional[str], choices: Sequence[str], *, case_insensitive=True, cutoff=0.8) -> Optional[str]:
     if not value:
         return value
     try:
@@ -271,6 +477,11 @@ def snap_one(value: Optional[str], choices: List[str], *, case_insensitive=True,
             return value
         pool = choices
         key = val.lower() if case_insensitive else val
+        # Exact hit through the artifact's vocab index (keys are lowercase): skip the fuzzy scan
+        if case_insensitive and getattr(pool, "indexed", False):
+            hit = pool.find(key)
+            if hit is not None:
+                return pool[hit]
         mapping = { (c.lower() if case_insensitive else c): c for c in pool }
         match = get_close_matches(key, list(mapping.keys()), n=1, cutoff=cutoff)
         if match:
@@ -279,7 +490,7 @@ def snap_one(value: Optional[str], choices: List[str], *, case_insensitive=True,
     except Exception:
         return value
 
-def snap_list(values: List[str], choices: List[str], *,
+def snap_list(values: List[str], choices: Sequence[str], *,
               lower=False, title_case=False, cutoff=0.8, max_items: int = 10) -> List[str]:
     seen = set()
     out: List[str] = []
@@ -305,26 +516,165 @@ def snap_list(values: List[str], choices: List[str], *,
     return out
 
 
+# ----- LLM call guards -----
+
+class LLMUnavailable(Exception):
+    """Raised when an LLM call is skipped, times out or fails; callers fall back to heuristics."""
+
+
+class CircuitBreaker:
+    """Rolling-window breaker for LLM calls.
+    Opens when errors, timeouts and slow calls make up at least `failure_ratio` of the
+    last `window` calls. While open every call is skipped; after `cooldown` seconds a
+    single probe call is let through and its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, *, window: int, min_calls: int, failure_ratio: float,
+                 slow_call: float, cooldown: float) -> None:
+        self.min_calls = max(1, min_calls)
+        self.failure_ratio = failure_ratio
+        self.slow_call = slow_call
+        self.cooldown = cooldown
+        self._outcomes: deque = deque(maxlen=max(1, window))
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._probing or time.monotonic() - self._opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> Optional[str]:
+        """Return "closed" or "probe" when a call may proceed, None when it must be skipped."""
+        if self._opened_at is None:
+            return "closed"
+        if self._probing or time.monotonic() - self._opened_at < self.cooldown:
+            return None
+        self._probing = True
+        return "probe"
+
+    def release_probe(self) -> None:
+        """The probe ended without an outcome (cancelled): let the next call probe instead."""
+        self._probing = False
+
+    def record(self, ok: bool, latency: float, *, probe: bool = False) -> None:
+        failed = (not ok) or latency >= self.slow_call
+        if probe:
+            self._probing = False
+            if failed:
+                self._opened_at = time.monotonic()
+            else:
+                self._opened_at = None
+                self._outcomes.clear()
+            return
+        if self._opened_at is not None:
+            # Late result of a call admitted before the breaker opened
+            return
+        self._outcomes.append(failed)
+        if len(self._outcomes) >= self.min_calls and \
+                sum(self._outcomes) / len(self._outcomes) >= self.failure_ratio:
+            self._opened_at = time.monotonic()
+
+
+llm_breaker = CircuitBreaker(
+    window=settings.llm_breaker_window,
+    min_calls=settings.llm_breaker_min_calls,
+    failure_ratio=settings.llm_breaker_failure_ratio,
+    slow_call=settings.llm_breaker_slow_call,
+    cooldown=settings.llm_breaker_cooldown,
+)
+
+
+async def _hedged_ainvoke(llm, prompt, hedge_delay: float):
+    """Await llm.ainvoke; if it straggles past hedge_delay, race a duplicate call."""
+    if hedge_delay <= 0:
+        return await llm.ainvoke(prompt)
+    tasks = [asyncio.ensure_future(llm.ainvoke(prompt))]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+        if not done:
+            tasks.append(asyncio.ensure_future(llm.ainvoke(prompt)))
+        pending = set(tasks)
+        last_exc: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for t in done:
+                if t.exception() is None:
+                    return t.result()
+                last_exc = t.exception()
+        raise last_exc or RuntimeError("hedged LLM call failed")
+    finally:
+        for t in tasks:
+            if not t.done():
+                t.cancel()
+
+
+async def invoke_llm(llm, prompt, *, deadline: Optional[float] = None):
+    """Call the LLM under the circuit breaker, the per-call timeout and an optional
+    request deadline (event-loop time). Raises LLMUnavailable instead of waiting longer.
+    """
+    loop = asyncio.get_running_loop()
+    timeout = settings.llm_call_timeout
+    if deadline is not None:
+        timeout = min(timeout, deadline - loop.time())
+    if timeout <= 0:
+        raise LLMUnavailable("request deadline exhausted")
+    admission = llm_breaker.allow()
+    if admission is None:
+        raise LLMUnavailable("circuit open")
+    start = loop.time()
+    try:
+        resp = await asyncio.wait_for(_hedged_ainvoke(llm, prompt, settings.llm_hedge_delay), timeout)
+    except asyncio.CancelledError:
+        # Cancelled by the caller (client gone, job stopped): no verdict, but never keep the probe slot
+        if admission == "probe":
+            llm_breaker.release_probe()
+        raise
+    except Exception as e:
+        llm_breaker.record(False, loop.time() - start, probe=admission == "probe")
+        raise LLMUnavailable(str(e) or type(e).__name__) from e
+    llm_breaker.record(True, loop.time() - start, probe=admission == "probe")
+    return resp
+
+
+def request_deadline() -> float:
+    """Event-loop time by which all LLM work for the current request must finish."""
+    return asyncio.get_running_loop().time() + settings.llm_request_budget
+
+
+def shortlist_size(k: int) -> int:
+    return max(1, k * 3)  # broaden before LLM re-rank
+
+
 def prefilter_pairs(needs: List[CardData], gives: List[CardData], k: int) -> Dict[str, List[Tuple[CardData, float]]]:
     """Use tag overlap to shortlist top-k gives for each need."""
     result: Dict[str, List[Tuple[CardData, float]]] = {}
+    give_tags = [gather_tags(g) for g in gives]
     for n in needs:
         n_tags = gather_tags(n)
-        scored = [(g, jaccard(n_tags, gather_tags(g))) for g in gives]
+        scored = [(g, jaccard(n_tags, gt)) for g, gt in zip(gives, give_tags)]
         scored.sort(key=lambda x: x[1], reverse=True)
-        result[n.id] = scored[: max(1, k * 3)]  # broaden before LLM re-rank
+        result[n.id] = scored[: shortlist_size(k)]
     return result
 
 
-async def llm_score_pair(llm, need: CardData, give: CardData) -> Tuple[float, Optional[str], float]:
+def heuristic_score_pair(need: CardData, give: CardData) -> Tuple[float, Optional[str], float]:
+    score = max(
+        jaccard(gather_tags(need), gather_tags(give)),
+        jaccard(need.tags, give.tags) * 0.8,
+    )
+    return (round(float(score), 4), None, 0.0)
+
+
+async def llm_score_pair(llm, need: CardData, give: CardData, *,
+                         deadline: Optional[float] = None) -> Tuple[float, Optional[str], float]:
     """Return (similarity_score[0..1], suggested_category, confidence[0..1])."""
     if llm is None:
         # heuristic fallback
-        score = max(
-            jaccard(gather_tags(need), gather_tags(give)),
-            jaccard(need.tags, give.tags) * 0.8,
-        )
-        return (round(float(score), 4), None, 0.0)
+        return heuristic_score_pair(need, give)
 
     prompt = (
         "You are a matching assistant. Given a 'Need' and a 'Give' item, "
@@ -332,9 +682,8 @@ async def llm_score_pair(llm, need: CardData, give: CardData) -> Tuple[float, Op
         f"NEED: {need.title}\nDesc: {need.description}\nTags: {need.tags}\nSkills: {need.skills}\n"
         f"GIVE: {give.title}\nDesc: {give.description}\nTags: {give.tags}\nSkills: {give.skills}"
     )
-    print(prompt)
     try:
-        resp = await llm.ainvoke(prompt)
+        resp = await invoke_llm(llm, prompt, deadline=deadline)
         content = resp.content if hasattr(resp, "content") else str(resp)
         # Extract JSON-like structure
         import re
@@ -347,66 +696,756 @@ async def llm_score_pair(llm, need: CardData, give: CardData) -> Tuple[float, Op
         conf = float(data.get("confidence", 0.0))
         return (max(0.0, min(1.0, score)), cat, max(0.0, min(1.0, conf)))
     except Exception:
-        score = jaccard(gather_tags(need), gather_tags(give))
-        return (round(float(score), 4), None, 0.0)
+        # LLM skipped, late or unparsable: degrade to the tag-overlap heuristic
+        return heuristic_score_pair(need, give)
+
+
+# need/give id -> [(counterpart id, score)], the plain form of needMatches/giveMatches
+MatchPairs = Dict[str, List[Tuple[str, float]]]
+
+
+def suggest_category(item: CardData) -> CategorySuggestion:
+    # naive: pick most frequent tag as category if not present
+    from collections import Counter
+    tag_counts = Counter([t.lower() for t in item.tags])
+    suggested = None
+    conf = 0.0
+    if tag_counts:
+        suggested, count = tag_counts.most_common(1)[0]
+        conf = min(1.0, count / max(1, len(item.tags)))
+    return CategorySuggestion(
+        id=item.id, originalCategory=item.category, suggestedCategory=suggested, confidence=conf
+    )
 
 
-async def compute_matches(req: MatchRequest) -> MatchResponse:
-    # Initialize LLM if possible
-    llm = None
-    if settings.openai_api_key and ChatOpenAI is not None:
-        llm = ChatOpenAI(model=settings.openai_model, api_key=settings.openai_api_key, temperature=0.0)
+# ----- Local category classifier -----
 
-    # Prefilter
-    shortlist = prefilter_pairs(req.needs, req.gives, req.top_k)
+@lru_cache
+def get_category_classifier() -> Optional[CategoryClassifier]:
+    """Load the classifier trained into the corpus artifact, else train once per process
+    from data.json; None without labels.
+    """
+    art = get_corpus_artifact()
+    if art is not None:
+        state = art.classifier_state()
+        return CategoryClassifier.from_state(state) if state is not None else None
+    extra = read_training_cards(REPO_ROOT / "data" / "needs_cases.json")
+    return train_category_classifier(_load_front_json(), extra)
 
-    need_matches: Dict[str, List[MatchResult]] = {}
-    give_matches: Dict[str, List[MatchResult]] = {g.id: [] for g in req.gives}
 
-    # Score with LLM (or fallback)
-    for n in req.needs:
+def suggest_categories(items: List[CardData]) -> List[CategorySuggestion]:
+    """Classify all items in one batch; falls back to the tag heuristic per item when the
+    classifier is unavailable or has no signal for it.
+    """
+    clf = get_category_classifier()
+    if clf is None:
+        return [suggest_category(c) for c in items]
+    preds = clf.predict_batch([
+        category_features(c.title, c.description, c.skills, [*c.tags, *(c.llmTags or [])]) for c in items
+    ])
+    out: List[CategorySuggestion] = []
+    for item, (cat, conf) in zip(items, preds):
+        if cat is None:
+            out.append(suggest_category(item))
+            continue
+        out.append(CategorySuggestion(
+            id=item.id, originalCategory=item.category, suggestedCategory=cat, confidence=conf
+        ))
+    return out
+
+
+def get_llm():
+    """Chat model for scoring/enrichment, or None when not configured."""
+    if not llm_configured():
+        return None
+    ChatOpenAI = chat_openai_class()
+    if ChatOpenAI is None:
+        return None
+    return ChatOpenAI(model=settings.openai_model, api_key=settings.openai_api_key, temperature=0.0)
+
+
+async def score_shortlists(llm, needs: List[CardData], gives: List[CardData],
+                           shortlist: Dict[str, List[Tuple[CardData, float]]], top_k: int,
+                           known: Optional[Dict[Tuple[str, str], float]] = None) -> Tuple[MatchPairs, MatchPairs]:
+    """Score each need's shortlist and build (need_pairs, give_pairs).
+    Pairs found in `known` (need id, give id) reuse that score instead of being scored again.
+    """
+    need_matches: MatchPairs = {}
+    give_matches: MatchPairs = {g.id: [] for g in gives}
+
+    # Score with LLM (or fallback); pairs still pending at the deadline use the heuristic
+    deadline = request_deadline()
+    for n in needs:
         candidates = shortlist.get(n.id, [])
-        tasks = [llm_score_pair(llm, n, g) for (g, _pref) in candidates]
-        results = await asyncio.gather(*tasks)
+        todo = [g for (g, _pref) in candidates if known is None or (n.id, g.id) not in known]
+        results = await asyncio.gather(*[llm_score_pair(llm, n, g, deadline=deadline) for g in todo])
+        fresh = {g.id: score for g, (score, _cat, _conf) in zip(todo, results)}
         scored: List[Tuple[str, float]] = []
-        for (g, _), (score, _cat, _conf) in zip(candidates, results):
+        for g, _ in candidates:
+            score = fresh[g.id] if g.id in fresh else known[(n.id, g.id)]
             scored.append((g.id, score))
-            give_matches[g.id].append(MatchResult(id=n.id, score=score))
+            give_matches[g.id].append((n.id, score))
         scored.sort(key=lambda x: x[1], reverse=True)
-        need_matches[n.id] = [MatchResult(id=gid, score=float(s)) for gid, s in scored[: req.top_k]]
+        need_matches[n.id] = [(gid, float(s)) for gid, s in scored[:top_k]]
+    return need_matches, give_matches
 
-    # Category suggestions (simple: choose most common or LLM-suggested)
-    suggestions: List[CategorySuggestion] = []
-    # For performance, suggest based on tags & existing category for now
-    from collections import Counter
 
-    def suggest(item: CardData) -> CategorySuggestion:
-        # naive: pick most frequent tag as category if not present
-        tag_counts = Counter([t.lower() for t in item.tags])
-        suggested = None
-        conf = 0.0
-        if tag_counts:
-            suggested, count = tag_counts.most_common(1)[0]
-            conf = min(1.0, count / max(1, len(item.tags)))
-        return CategorySuggestion(
-            id=item.id, originalCategory=item.category, suggestedCategory=suggested, confidence=conf
-        )
+async def score_local(req: MatchRequest, case_gives: Optional[List[CardData]] = None) -> Tuple[MatchPairs, MatchPairs]:
+    """Prefilter + score on this process. `case_gives` overrides the case corpus for includeCases.
+    Case cards the client already sent (same givecase-… id) are not added twice, and
+    added case cards appear in give_pairs only when some need matched them.
+    """
+    cases: List[CardData] = []
+    if req.includeCases:
+        sent = {g.id for g in req.gives}
+        cases = [c for c in (get_case_gives() if case_gives is None else case_gives) if c.id not in sent]
+    gives = [*req.gives, *cases] if cases else req.gives
+    # Prefilter (CPU-bound on large boards: run it off the event loop)
+    shortlist = await asyncio.to_thread(prefilter_pairs, req.needs, gives, req.top_k)
+    need_matches, give_matches = await score_shortlists(get_llm(), req.needs, gives, shortlist, req.top_k)
+    for c in cases:
+        if not give_matches[c.id]:
+            del give_matches[c.id]
+    return need_matches, give_matches
+
+
+async def score_matches(req: MatchRequest, report: Optional[dict] = None) -> Tuple[MatchPairs, MatchPairs, List[CategorySuggestion]]:
+    """Run matching and return raw (need_pairs, give_pairs, suggestions) without building
+    per-pair MatchResult models; see build_match_response / compact_match_payload.
+    With MATCH_SHARDS set, scoring is scattered to the shards; `report` receives the
+    indexes of shards missing from the result.
+    """
+    if match_shard_urls:
+        need_matches, give_matches = await scatter_gather_matches(req, report)
+    else:
+        need_matches, give_matches = await score_local(req)
+
+    # Category suggestions; for performance, based on tags & existing category for now
+    suggestions = await asyncio.to_thread(suggest_categories, [*req.needs, *req.gives])
+    return need_matches, give_matches, suggestions
+
 
+async def score_matches_delta(req: MatchDeltaRequest) -> Tuple[MatchPairs, MatchPairs, List[CategorySuggestion]]:
+    """Update `req.previous` for the current boards, re-scoring only pairs that involve an
+    added or changed card or that newly enter a shortlist. The result equals a full
+    score_matches run (for deterministic scorers) as long as `previous` was computed
+    with the same top_k.
+
+    previous.giveMatches lists every shortlisted (need, give) pair with its score, so it
+    doubles as the pair-score cache and as each need's previous shortlist.
+    """
+    prev = req.previous
+    changed = set(req.changedIds)
+    m = shortlist_size(req.top_k)
+    need_ids = {n.id for n in req.needs}
+    give_pos = {g.id: i for i, g in enumerate(req.gives)}
+    prev_gives = list(prev.giveMatches)
+
+    dirty_needs = changed | (need_ids - set(prev.needMatches))
+    dirty_gives = (changed & set(give_pos)) | (set(give_pos) - set(prev_gives))
+    gone_gives = (changed | (set(prev_gives) - set(give_pos))) & set(prev_gives)
+
+    known: Dict[Tuple[str, str], float] = {}
+    prev_shortlist: Dict[str, List[str]] = {}
+    for gid, ms in prev.giveMatches.items():
+        for mr in ms:
+            prev_shortlist.setdefault(mr.id, []).append(gid)
+            if gid not in changed and mr.id not in changed:
+                known[(mr.id, gid)] = mr.score
+
+    # Merging is exact only if unchanged gives kept their relative order and previous
+    # shortlists have the size this top_k produces; otherwise rescan every need.
+    stable = [g for g in prev_gives if g in give_pos and g not in changed]
+    merge_ok = stable == [g.id for g in req.gives if g.id in prev.giveMatches and g.id not in changed]
+    expected = min(m, len(prev_gives))
+    merge_ok = merge_ok and all(len(prev_shortlist.get(nid, [])) == expected for nid in prev.needMatches)
+
+    give_tags: Dict[str, List[str]] = {}
+
+    def tags_of(g: CardData) -> List[str]:
+        if g.id not in give_tags:
+            give_tags[g.id] = gather_tags(g)
+        return give_tags[g.id]
+
+    shortlist: Dict[str, List[Tuple[CardData, float]]] = {}
+    entering = [req.gives[give_pos[gid]] for gid in sorted(dirty_gives, key=give_pos.__getitem__)]
     for n in req.needs:
-        suggestions.append(suggest(n))
+        before = prev_shortlist.get(n.id, [])
+        if merge_ok and n.id not in dirty_needs and not (set(before) & gone_gives):
+            # Anything outside the old shortlist still ranks below it; only entering gives can move in
+            pool = [req.gives[give_pos[gid]] for gid in before] + entering
+        else:
+            pool = req.gives
+        n_tags = gather_tags(n)
+        scored = [(g, jaccard(n_tags, tags_of(g))) for g in pool]
+        scored.sort(key=lambda x: (-x[1], give_pos[x[0].id]))
+        shortlist[n.id] = scored[:m]
+
+    need_matches, give_matches = await score_shortlists(
+        get_llm(), req.needs, req.gives, shortlist, req.top_k, known=known,
+    )
+
+    prev_suggestions = {c.id: c for c in prev.categorySuggestions}
+    cards = [*req.needs, *req.gives]
+    fresh = [c for c in cards
+             if c.id not in prev_suggestions or c.id in dirty_needs or c.id in dirty_gives]
+    fresh_suggestions = {s.id: s for s in suggest_categories(fresh)}
+    suggestions = [fresh_suggestions.get(c.id) or prev_suggestions[c.id] for c in cards]
+    return need_matches, give_matches, suggestions
+
+
+def build_match_response(need_pairs: MatchPairs, give_pairs: MatchPairs,
+                         suggestions: List[CategorySuggestion]) -> MatchResponse:
+    # Values come from our own scoring, so skip per-item validation
+    def results(pairs: MatchPairs) -> Dict[str, List[MatchResult]]:
+        return {k: [MatchResult.model_construct(id=i, score=sc) for i, sc in v] for k, v in pairs.items()}
+    return MatchResponse.model_construct(
+        needMatches=results(need_pairs),
+        giveMatches=results(give_pairs),
+        categorySuggestions=suggestions,
+    )
+
+
+# ----- Scatter-gather across shards -----
+
+def shard_of(card_id: str, shards: int) -> int:
+    """Stable shard for a card id: the same on every process (unlike the salted hash())."""
+    if shards <= 1:
+        return 0
+    digest = hashlib.blake2b(card_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shards
+
+
+def shard_case_gives(shard: int, shards: int) -> List[CardData]:
+    """The case-corpus gives owned by `shard` of `shards`."""
+    cases = list(get_case_gives())
+    if settings.shard_count > 1:
+        # Ingestion already kept only this node's partition; it must be the one asked for
+        if (shard, shards) != (settings.shard_index, settings.shard_count):
+            raise HTTPException(
+                status_code=409,
+                detail=f"Node holds shard {settings.shard_index}/{settings.shard_count}, asked for {shard}/{shards}",
+            )
+        return cases
+    return [c for c in cases if shard_of(c.id, shards) == shard]
+
+
+def shard_timeout() -> float:
+    if settings.match_shard_timeout is not None:
+        return settings.match_shard_timeout
+    return settings.llm_request_budget + 5.0
+
+
+@lru_cache
+def get_shard_client():
+    import httpx
+    return httpx.AsyncClient(timeout=shard_timeout())
+
+
+def shard_gives(req: ShardMatchRequest, case_gives: Optional[List[CardData]]) -> List[CardData]:
+    """This shard's gives: the coordinator's partition plus case cards it did not send."""
+    if not case_gives:
+        return list(req.gives)
+    sent = {g.id for g in req.gives}
+    return [*req.gives, *(c for c in case_gives if c.id not in sent)]
+
+
+async def _call_shards(bodies: Dict[int, Tuple[str, dict]], report_missing: List[int]) -> Dict[int, dict]:
+    """POST each shard's (path, body) concurrently; shards that fail or miss
+    shard_timeout() are appended to `report_missing`.
+    """
+    urls = match_shard_urls
+    client = get_shard_client()
+
+    async def call(i: int) -> dict:
+        path, body = bodies[i]
+        r = await client.post(f"{urls[i].rstrip('/')}{path}", json=body)
+        r.raise_for_status()
+        return r.json()
+
+    tasks = {i: asyncio.create_task(call(i)) for i in bodies}
+    if not tasks:
+        return {}
+    done, pending = await asyncio.wait(tasks.values(), timeout=shard_timeout())
+    for t in pending:
+        t.cancel()
+    replies: Dict[int, dict] = {}
+    for i, t in tasks.items():
+        if t in done and t.exception() is None:
+            replies[i] = t.result()
+        else:
+            report_missing.append(i)
+            reason = "timed out" if t in pending else repr(t.exception())
+            print(f"[shards] shard {i} ({urls[i]}) {reason}")
+    return replies
+
+
+async def scatter_gather_matches(req: MatchRequest, report: Optional[dict] = None) -> Tuple[MatchPairs, MatchPairs]:
+    """Two-phase scatter-gather over MATCH_SHARDS, with the same result as a single node:
+    1. every shard prefilters its partition of the gives (plus its case cards) for all
+       needs; the coordinator merges these into each need's global shortlist
+       (shortlist_size(top_k) gives, ordered by overlap, then request / case-file order);
+    2. each shard scores only the shortlisted pairs it owns, so a pair is scored once.
+    Shards that fail or miss shard_timeout() in either phase are dropped (their
+    gives get no matches) and listed in report["missing"].
+    """
+    n = len(match_shard_urls)
+    missing: List[int] = []
+    if report is not None:
+        report["missing"] = missing
+
+    def card_json(c) -> dict:
+        return c.as_card() if isinstance(c, LiteCard) else c.model_dump(mode="json")
+
+    need_json = {c.id: card_json(c) for c in req.needs}
+    give_json = {c.id: card_json(c) for c in req.gives}
+    parts: List[List[str]] = [[] for _ in range(n)]
     for g in req.gives:
-        suggestions.append(suggest(g))
+        parts[shard_of(g.id, n)].append(g.id)
+
+    # Phase 1: per-shard shortlists, merged into the global one
+    prefiltered = await _call_shards({
+        i: ("/match/shard/prefilter", {
+            "needs": list(need_json.values()), "gives": [give_json[gid] for gid in parts[i]],
+            "top_k": req.top_k, "includeCases": req.includeCases, "shard": i, "shards": n,
+        }) for i in range(n)
+    }, missing)
+    give_order = {g.id: i for i, g in enumerate(req.gives)}
+    owner: Dict[str, int] = {}
+    for i, reply in prefiltered.items():
+        for gid, pos in (reply.get("caseOrder") or {}).items():
+            give_order.setdefault(gid, len(req.gives) + pos)
+        for pairs in reply["shortlists"].values():
+            for gid, _overlap in pairs:
+                owner[gid] = i
+    shortlists: Dict[str, List[str]] = {}
+    for nd in req.needs:
+        merged = [(gid, overlap) for i in sorted(prefiltered)
+                  for gid, overlap in prefiltered[i]["shortlists"].get(nd.id, [])]
+        merged.sort(key=lambda p: (-p[1], give_order[p[0]]))
+        shortlists[nd.id] = [gid for gid, _ in merged[: shortlist_size(req.top_k)]]
+
+    # Phase 2: each shard scores the shortlisted pairs it owns
+    shard_pairs: Dict[int, Dict[str, List[str]]] = {}
+    for nid, gids in shortlists.items():
+        for gid in gids:
+            shard_pairs.setdefault(owner[gid], {}).setdefault(nid, []).append(gid)
+    scored = await _call_shards({
+        i: ("/match/shard/score", {
+            "needs": [need_json[nid] for nid in pairs],
+            "gives": [give_json[gid] for gid in dict.fromkeys(g for gids in pairs.values() for g in gids)
+                      if gid in give_json],
+            "pairs": pairs, "includeCases": req.includeCases, "shard": i, "shards": n,
+        }) for i, pairs in shard_pairs.items()
+    }, missing)
+    scores: Dict[Tuple[str, str], float] = {}
+    for i, reply in scored.items():
+        for nid, values in reply["scores"].items():
+            for gid, score in zip(shard_pairs[i][nid], values):
+                scores[(nid, gid)] = float(score)
+
+    # Assemble exactly like score_shortlists / score_local
+    need_matches: MatchPairs = {}
+    give_matches: MatchPairs = {g.id: [] for g in req.gives}
+    case_matches: MatchPairs = {}
+    for nd in req.needs:
+        ranked: List[Tuple[str, float]] = []
+        for gid in shortlists[nd.id]:
+            if (nd.id, gid) not in scores:
+                continue  # owner shard missed phase 2
+            score = scores[(nd.id, gid)]
+            ranked.append((gid, score))
+            (give_matches[gid] if gid in give_matches else case_matches.setdefault(gid, [])).append((nd.id, score))
+        ranked.sort(key=lambda x: x[1], reverse=True)
+        need_matches[nd.id] = ranked[: req.top_k]
+    for gid in sorted(case_matches, key=give_order.__getitem__):
+        give_matches[gid] = case_matches[gid]
+    missing.sort()
+    return need_matches, give_matches
+
+
+# ----- Compact response format -----
+
+COMPACT_MEDIA_TYPE = "application/vnd.matches.compact+json"
+
+
+def wants_compact(request: Request, format: Optional[str]) -> bool:
+    """Compact output is opt-in via ?format=compact or an Accept header naming COMPACT_MEDIA_TYPE."""
+    if format:
+        return format.strip().lower() == "compact"
+    return COMPACT_MEDIA_TYPE in (request.headers.get("accept") or "")
+
+
+def compact_match_payload(need_pairs: MatchPairs, give_pairs: MatchPairs,
+                          suggestions: List[CategorySuggestion]) -> dict:
+    """Columnar MatchResponse: parallel ids/scores arrays per need and per give, and
+    parallel arrays for category suggestions.
+    """
+    def columns(pairs: MatchPairs) -> Dict[str, dict]:
+        return {k: {"ids": [i for i, _ in v], "scores": [sc for _, sc in v]} for k, v in pairs.items()}
+    return {
+        "format": "compact",
+        "needMatches": columns(need_pairs),
+        "giveMatches": columns(give_pairs),
+        "categorySuggestions": {
+            "ids": [c.id for c in suggestions],
+            "originalCategory": [c.originalCategory for c in suggestions],
+            "suggestedCategory": [c.suggestedCategory for c in suggestions],
+            "confidence": [c.confidence for c in suggestions],
+        },
+    }
+
+
+def dump_json(obj) -> bytes:
+    """Serialize with orjson when installed, else a compact stdlib encoding."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def compact_response(need_pairs: MatchPairs, give_pairs: MatchPairs,
+                     suggestions: List[CategorySuggestion], **extra) -> Response:
+    payload = compact_match_payload(need_pairs, give_pairs, suggestions)
+    payload.update(extra)
+    return Response(content=dump_json(payload), media_type=COMPACT_MEDIA_TYPE)
 
-    return MatchResponse(needMatches=need_matches, giveMatches=give_matches, categorySuggestions=suggestions)
+
+# ----- Indexed match store -----
+# /save writes matches.json (canonical) plus a SQLite copy keyed by (side, entity, rank),
+# so /matches can page and filter without loading the whole history.
+
+_SIDES = {"need": 0, "give": 1}
+
+
+def _store_stamp(path: Path) -> str:
+    st = path.stat()
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+def write_match_store(res: MatchResponse, *, stamp: str, db_path: Optional[Path] = None) -> None:
+    """Rebuild the SQLite index in a temp file and swap it in atomically."""
+    import tempfile
+    db_path = db_path or STORE_DB
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    # Unique per writer, so concurrent saves never build into the same file
+    with tempfile.NamedTemporaryFile(dir=db_path.parent, prefix=db_path.name + ".", suffix=".tmp",
+                                     delete=False) as f:
+        tmp = Path(f.name)
+    try:
+        con = sqlite3.connect(tmp)
+        try:
+            con.executescript("""
+                CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE entities (side INTEGER, pos INTEGER, id TEXT, PRIMARY KEY (side, pos));
+                CREATE TABLE matches (side INTEGER, entity TEXT, rank INTEGER, other TEXT, score REAL);
+                CREATE TABLE suggestions (seq INTEGER PRIMARY KEY, side INTEGER, entity TEXT,
+                                          id TEXT, original TEXT, suggested TEXT, confidence REAL);
+                CREATE UNIQUE INDEX entities_id ON entities (side, id);
+                CREATE INDEX matches_entity ON matches (side, entity, rank);
+                CREATE INDEX suggestions_entity ON suggestions (side, entity);
+            """)
+            for side, coll in ((0, res.needMatches), (1, res.giveMatches)):
+                con.executemany("INSERT INTO entities VALUES (?, ?, ?)",
+                                [(side, pos, eid) for pos, eid in enumerate(coll)])
+                con.executemany("INSERT INTO matches VALUES (?, ?, ?, ?, ?)",
+                                [(side, eid, rank, m.id, m.score)
+                                 for eid, ms in coll.items() for rank, m in enumerate(ms)])
+            con.executemany("INSERT INTO suggestions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            [(seq, side, None if side is None else c.id, c.id,
+                              c.originalCategory, c.suggestedCategory, c.confidence)
+                             for seq, (side, c) in enumerate(_suggestion_sides(res))])
+            con.execute("INSERT INTO meta VALUES ('stamp', ?)", (stamp,))
+            con.commit()
+        finally:
+            con.close()
+        os.replace(tmp, db_path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _suggestion_sides(res: MatchResponse) -> List[Tuple[Optional[int], CategorySuggestion]]:
+    """Pair each suggestion with the entity side it describes. Suggestions come needs
+    first, then gives, so an id on both sides goes to the need first and the give next;
+    suggestions without a stored entity get side None.
+    """
+    ids = (set(res.needMatches), set(res.giveMatches))
+    taken: set = set()
+    out: List[Tuple[Optional[int], CategorySuggestion]] = []
+    for c in res.categorySuggestions:
+        side = next((s for s in (0, 1) if c.id in ids[s] and (s, c.id) not in taken), None)
+        if side is not None:
+            taken.add((side, c.id))
+        out.append((side, c))
+    return out
+
+
+def open_match_store() -> Optional[sqlite3.Connection]:
+    """Open the index, rebuilding it from STORE_PATH when missing or stale. None if nothing stored."""
+    if not STORE_PATH.exists():
+        return None
+    stamp = _store_stamp(STORE_PATH)
+    if STORE_DB.exists():
+        con = sqlite3.connect(f"file:{STORE_DB}?mode=ro", uri=True)
+        try:
+            row = con.execute("SELECT value FROM meta WHERE key = 'stamp'").fetchone()
+        except sqlite3.DatabaseError:
+            row = None
+        if row and row[0] == stamp:
+            return con
+        con.close()
+    with STORE_PATH.open("r", encoding="utf-8") as f:
+        write_match_store(MatchResponse(**json.load(f)), stamp=stamp)
+    return sqlite3.connect(f"file:{STORE_DB}?mode=ro", uri=True)
+
+
+def _encode_cursor(side: int, pos: int) -> str:
+    import base64
+    return base64.urlsafe_b64encode(f"{side}:{pos}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[int, int]:
+    import base64
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        side, pos = raw.split(":")
+        return int(side), int(pos)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def query_match_store(con: sqlite3.Connection, *, need_id: Optional[str] = None,
+                      give_id: Optional[str] = None, min_score: Optional[float] = None,
+                      top_n: Optional[int] = None, cursor: Optional[str] = None,
+                      limit: Optional[int] = None
+                      ) -> Tuple[MatchPairs, MatchPairs, List[CategorySuggestion], Optional[str]]:
+    """Select entities (needs first, then gives, in stored order) and their matches.
+    need_id/give_id restrict to those cards; min_score drops weaker matches; top_n keeps the
+    best n per entity; cursor/limit page over entities. Suggestions not tied to a stored
+    entity come with the last unfiltered page, so no parameters returns everything.
+    """
+    picks: List[str] = []
+    pick_params: List[object] = []
+    if need_id is not None:
+        picks.append("(e.side = 0 AND e.id = ?)")
+        pick_params.append(need_id)
+    if give_id is not None:
+        picks.append("(e.side = 1 AND e.id = ?)")
+        pick_params.append(give_id)
+    pick = ["(" + " OR ".join(picks) + ")"] if picks else []
+    where = list(pick)
+    params: List[object] = list(pick_params)
+    if cursor:
+        where.append("(e.side, e.pos) > (?, ?)")
+        params.extend(_decode_cursor(cursor))
+    sql = "SELECT e.side, e.pos, e.id FROM entities e"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY e.side, e.pos"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit + 1)  # one extra row tells us whether another page exists
+    rows = con.execute(sql, params).fetchall()
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1][0], rows[-1][1])
+
+    sides: Tuple[MatchPairs, MatchPairs] = ({}, {})
+    for side, _pos, eid in rows:
+        sides[side][eid] = []
+    # The page is every picked entity between its first and last row: one query per table
+    page = " AND ".join([*pick, "(e.side, e.pos) >= (?, ?)", "(e.side, e.pos) <= (?, ?)"])
+    page_params = [*pick_params, *rows[0][:2], *rows[-1][:2]] if rows else []
+    if rows:
+        order = "m.score DESC, m.rank" if top_n is not None else "m.rank"
+        match_sql = f"""
+            SELECT side, entity, other, score FROM (
+                SELECT m.side, m.entity, m.other, m.score, e.pos,
+                       ROW_NUMBER() OVER (PARTITION BY m.side, m.entity ORDER BY {order}) AS n
+                FROM entities e JOIN matches m ON m.side = e.side AND m.entity = e.id
+                WHERE {page} AND m.score >= ?
+            ) WHERE ? < 0 OR n <= ? ORDER BY side, pos, n"""
+        floor = min_score if min_score is not None else float("-inf")
+        cap = top_n if top_n is not None else -1
+        for side, eid, other, score in con.execute(match_sql, [*page_params, floor, cap, cap]):
+            sides[side][eid].append((other, score))
+
+    orphans = not picks and next_cursor is None
+    if rows or orphans:
+        suggestion_sql = f"""
+            SELECT s.id, s.original, s.suggested, s.confidence FROM suggestions s
+            LEFT JOIN entities e ON e.side = s.side AND e.id = s.entity
+            WHERE {"(e.pos IS NOT NULL AND " + page + ")" if rows else "0"} OR (? AND s.side IS NULL)
+            ORDER BY s.seq"""
+        suggestions = [CategorySuggestion(id=r[0], originalCategory=r[1], suggestedCategory=r[2], confidence=r[3])
+                       for r in con.execute(suggestion_sql, [*page_params, int(orphans)])]
+    else:
+        suggestions = []
+    return sides[0], sides[1], suggestions, next_cursor
+
+
+# ----- Async match jobs -----
+
+class MatchJob:
+    def __init__(self, job_id: str, req: MatchRequest, priority: int) -> None:
+        self.id = job_id
+        self.req: Optional[MatchRequest] = req
+        self.priority = priority
+        self.seq = 0
+        self.status = "queued"  # queued -> running -> done | failed
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.result: Optional[Tuple[MatchPairs, MatchPairs, List[CategorySuggestion]]] = None
+        self.error: Optional[str] = None
+        self.missing_shards: List[int] = []  # scatter-gather shards left out of the result
+        self.changed = asyncio.Event()
+
+    def set_status(self, status: str) -> None:
+        self.status = status
+        # Wake current watchers, then re-arm for the next change
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def info(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "priority": self.priority,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "error": self.error,
+            "missingShards": self.missing_shards,
+        }
+
+
+class MatchJobQueue:
+    """Bounded priority queue of match jobs run by a fixed pool of asyncio workers.
+    Higher priority runs first (FIFO within a priority). When the queue is full, submit()
+    raises HTTP 429 with a Retry-After estimated from recent job durations. Finished jobs
+    are kept for `ttl` seconds. Workers only coordinate: score_matches runs its CPU-bound
+    steps in threads, so polls, event streams and admission stay responsive meanwhile.
+    """
+
+    def __init__(self, *, workers: int, maxsize: int, ttl: float) -> None:
+        self.workers = max(1, workers)
+        self.maxsize = max(1, maxsize)
+        self.ttl = ttl
+        self.jobs: Dict[str, MatchJob] = {}
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        # job id -> queue key of jobs not yet taken by a worker, for position()
+        self._pending: Dict[str, Tuple[int, int]] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._seq = 0
+        self._avg_seconds = 5.0  # EMA of job run time, seeds Retry-After
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.PriorityQueue(maxsize=self.maxsize)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def purge(self) -> None:
+        now = time.time()
+        for jid in [j.id for j in self.jobs.values() if j.finished and now - j.finished > self.ttl]:
+            del self.jobs[jid]
+
+    def retry_after(self) -> int:
+        import math
+        depth = self._queue.qsize() if self._queue else 0
+        return max(1, math.ceil(self._avg_seconds * (depth + 1) / self.workers))
+
+    def submit(self, req: MatchRequest, priority: int = 0) -> MatchJob:
+        import uuid
+        self.start()
+        self.purge()
+        job = MatchJob(uuid.uuid4().hex, req, priority)
+        self._seq += 1
+        job.seq = self._seq
+        try:
+            self._queue.put_nowait((-priority, job.seq, job.id))
+        except asyncio.QueueFull:
+            raise HTTPException(
+                status_code=429,
+                detail="Match queue is full; retry later",
+                headers={"Retry-After": str(self.retry_after())},
+            )
+        self._pending[job.id] = (-priority, job.seq)
+        self.jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> MatchJob:
+        self.purge()
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Unknown or expired job")
+        return job
+
+    def position(self, job: MatchJob) -> Optional[int]:
+        """1-based place among queued jobs, in the order workers will take them."""
+        key = self._pending.get(job.id)
+        if job.status != "queued" or key is None:
+            return None
+        return 1 + sum(1 for other in self._pending.values() if other < key)
+
+    async def _worker(self) -> None:
+        while True:
+            _p, _seq, job_id = await self._queue.get()
+            self._pending.pop(job_id, None)
+            job = self.jobs.get(job_id)
+            if job is None or job.req is None:
+                continue
+            job.started = time.time()
+            job.set_status("running")
+            try:
+                report: dict = {}
+                job.result = await score_matches(job.req, report)
+                job.missing_shards = report.get("missing") or []
+                job.finished = time.time()
+                job.set_status("done")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.error = str(e) or type(e).__name__
+                job.finished = time.time()
+                job.set_status("failed")
+            finally:
+                job.req = None  # drop the (possibly large) payload once processed
+            self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * (job.finished - job.started)
+
+
+match_jobs = MatchJobQueue(
+    workers=settings.match_jobs_workers,
+    maxsize=settings.match_jobs_queue_size,
+    ttl=settings.match_jobs_ttl,
+)
 
 
 # ------------ Routes --------------
 
 @app.get("/health")
 def health():
+    """Liveness: the process is up. Does not wait for warmup."""
     return {"status": "ok"}
 
 
+@app.get("/ready")
+def ready(response: Response):
+    """Readiness: 503 until corpus caches are warm, so load balancers hold traffic until then."""
+    if not warmup_state["ready"]:
+        response.status_code = 503
+        return {"status": "warming"}
+    return {"status": "ready", "warmupSeconds": warmup_state["seconds"], "error": warmup_state["error"]}
+
+
 @app.get("/llm/health")
 async def llm_health(performCall: bool = False):
     """LLM readiness probe.
@@ -414,12 +1453,13 @@ async def llm_health(performCall: bool = False):
     - ready: if performCall=true, attempts a tiny completion to validate connectivity
     Note: The active model is reported but can be overridden via env OPENAI_MODEL.
     """
-    configured = bool(settings.openai_api_key and ChatOpenAI is not None)
+    configured = llm_configured()
     status = {
         "configured": configured,
         "model": settings.openai_model,
         "ready": False,
         "error": None,
+        "breaker": llm_breaker.state,
     }
     if not configured:
         return status
@@ -428,7 +1468,7 @@ async def llm_health(performCall: bool = False):
         status["ready"] = True
         return status
     try:
-        llm = ChatOpenAI(model=settings.openai_model, api_key=settings.openai_api_key, temperature=0.0)
+        llm = get_llm()
         async def _ping():
             resp = await llm.ainvoke("Reply with a single word: ok")
             content = getattr(resp, "content", str(resp))
@@ -452,94 +1492,259 @@ async def get_categories():
     return CategoriesResponse(needsCategories=list(dict.fromkeys(needs)), givesCategories=list(dict.fromkeys(gives)))
 
 
-@app.get("/matches", response_model=MatchResponse)
-async def get_matches():
-    if not STORE_PATH.exists():
+@app.get("/matches", response_model=MatchPage)
+async def get_matches(
+    request: Request,
+    format: Optional[str] = None,
+    needId: Optional[str] = None,
+    giveId: Optional[str] = None,
+    minScore: Optional[float] = None,
+    topN: Optional[int] = Query(default=None, ge=1),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=1000),
+):
+    """Stored matches. Without parameters returns everything; needId/giveId/minScore/topN
+    filter and cursor/limit page over entities (follow nextCursor until it is null).
+    """
+    con = open_match_store()
+    if con is None:
         raise HTTPException(status_code=404, detail="No stored matches")
-    with STORE_PATH.open("r", encoding="utf-8") as f:
-        return MatchResponse(**json.load(f))
+    try:
+        need_pairs, give_pairs, suggestions, next_cursor = query_match_store(
+            con, need_id=needId, give_id=giveId, min_score=minScore,
+            top_n=topN, cursor=cursor, limit=limit,
+        )
+    finally:
+        con.close()
+    if wants_compact(request, format):
+        return compact_response(need_pairs, give_pairs, suggestions, nextCursor=next_cursor)
+    page = build_match_response(need_pairs, give_pairs, suggestions)
+    return MatchPage.model_construct(**dict(page), nextCursor=next_cursor)
 
 
 @app.post("/match", response_model=MatchResponse)
-async def post_match(req: MatchRequest):
-    res = await compute_matches(req)
-    return res
+async def post_match(req: MatchRequest, request: Request, response: Response, format: Optional[str] = None):
+    """Default body is MatchResponse; ?format=compact or Accept: COMPACT_MEDIA_TYPE
+    returns the columnar form, serialized directly without response-model validation.
+    As a scatter-gather coordinator, X-Match-Missing-Shards lists shards left out of a
+    partial result.
+    """
+    return await match_response(req, request, response, format)
+
+
+async def match_response(req, request: Request, response: Response, format: Optional[str]):
+    report: dict = {}
+    need_pairs, give_pairs, suggestions = await score_matches(req, report)
+    if wants_compact(request, format):
+        response = compact_response(need_pairs, give_pairs, suggestions)
+    if report.get("missing"):
+        response.headers["X-Match-Missing-Shards"] = ",".join(map(str, report["missing"]))
+    if wants_compact(request, format):
+        return response
+    return build_match_response(need_pairs, give_pairs, suggestions)
+
+
+@app.post(
+    "/match/fast",
+    response_model=MatchResponse,
+    openapi_extra={"requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": {"$ref": "#/components/schemas/MatchRequest"}}},
+    }},
+)
+async def post_match_fast(request: Request, response: Response, format: Optional[str] = None):
+    """Same body and response as /match, decoded by fast_decode: only the fields matching
+    reads are kept, in slotted records, instead of validating full CardData models.
+    """
+    try:
+        req = decode_match_request(await request.body())
+    except DecodeError as e:
+        raise RequestValidationError(e.errors)
+    return await match_response(req, request, response, format)
+
+
+def _check_shard(shard: int, shards: int) -> None:
+    if not 0 <= shard < max(1, shards):
+        raise HTTPException(status_code=400, detail="shard must be in [0, shards)")
+
+
+@app.post("/match/shard/prefilter")
+async def post_match_shard_prefilter(req: ShardMatchRequest):
+    """Scatter-gather phase 1: each need's shortlist over this shard's gives, as
+    [give id, overlap] pairs, plus case-file positions for tie-breaking.
+    """
+    _check_shard(req.shard, req.shards)
+    case_gives = shard_case_gives(req.shard, req.shards) if req.includeCases else None
+    shortlist = await asyncio.to_thread(prefilter_pairs, req.needs, shard_gives(req, case_gives), req.top_k)
+    shortlists = {nid: [(g.id, overlap) for g, overlap in pairs] for nid, pairs in shortlist.items()}
+    case_order = {gid: case_position(gid) for pairs in shortlists.values() for gid, _ in pairs
+                  if case_position(gid) is not None}
+    return Response(content=dump_json({"shortlists": shortlists, "caseOrder": case_order}),
+                    media_type="application/json")
+
+
+@app.post("/match/shard/score")
+async def post_match_shard_score(req: ShardScoreRequest):
+    """Scatter-gather phase 2: scores for the requested pairs, in request order."""
+    _check_shard(req.shard, req.shards)
+    gives = {g.id: g for g in shard_case_gives(req.shard, req.shards)} if req.includeCases else {}
+    gives.update((g.id, g) for g in req.gives)
+    needs = {n.id: n for n in req.needs}
+    unknown = [gid for gids in req.pairs.values() for gid in gids if gid not in gives]
+    if unknown or set(req.pairs) - set(needs):
+        raise HTTPException(status_code=400, detail=f"Unknown cards in pairs: {unknown[:5]}")
+    llm, deadline = get_llm(), request_deadline()
+    scores: Dict[str, List[float]] = {}
+    for nid, gids in req.pairs.items():
+        results = await asyncio.gather(*[llm_score_pair(llm, needs[nid], gives[gid], deadline=deadline) for gid in gids])
+        scores[nid] = [score for score, _cat, _conf in results]
+    return Response(content=dump_json({"scores": scores}), media_type="application/json")
+
+
+@app.post("/match/jobs", status_code=202)
+async def post_match_job(req: MatchRequest, priority: int = 0):
+    """Queue a match; poll GET /match/jobs/{id} (or stream /events) and fetch /result.
+    Returns 429 with Retry-After when the queue is full.
+    """
+    job = match_jobs.submit(req, priority)
+    return {**job.info(), "position": match_jobs.position(job)}
+
+
+@app.get("/match/jobs/{job_id}")
+async def get_match_job(job_id: str):
+    job = match_jobs.get(job_id)
+    return {**job.info(), "position": match_jobs.position(job)}
+
+
+@app.get("/match/jobs/{job_id}/events")
+async def stream_match_job(job_id: str):
+    """Server-sent events: one `status` event per state change until done/failed."""
+    job = match_jobs.get(job_id)
+
+    async def events():
+        while True:
+            changed = job.changed
+            yield f"event: status\ndata: {json.dumps(job.info())}\n\n"
+            if job.status in ("done", "failed"):
+                return
+            while True:
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=15)
+                    break
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.get("/match/jobs/{job_id}/result", response_model=MatchResponse)
+async def get_match_job_result(job_id: str, request: Request, response: Response, format: Optional[str] = None):
+    """Partial scatter-gather results carry X-Match-Missing-Shards, as on /match."""
+    job = match_jobs.get(job_id)
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error or "Job failed")
+    if job.status != "done" or job.result is None:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    if wants_compact(request, format):
+        response = compact_response(*job.result)
+    if job.missing_shards:
+        response.headers["X-Match-Missing-Shards"] = ",".join(map(str, job.missing_shards))
+    if wants_compact(request, format):
+        return response
+    return build_match_response(*job.result)
+
+
+@app.post("/match/delta", response_model=MatchResponse)
+async def post_match_delta(req: MatchDeltaRequest, request: Request, format: Optional[str] = None):
+    need_pairs, give_pairs, suggestions = await score_matches_delta(req)
+    if wants_compact(request, format):
+        return compact_response(need_pairs, give_pairs, suggestions)
+    return build_match_response(need_pairs, give_pairs, suggestions)
 
 
 @app.post("/save", response_model=MatchResponse)
 async def save_matches(res: MatchResponse):
     STORE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with STORE_PATH.open("w", encoding="utf-8") as f:
-        json.dump(json.loads(res.model_dump_json()), f, ensure_ascii=False, indent=2)
+    # model_dump_json already emits UTF-8 (non-ASCII unescaped); write it as-is
+    STORE_PATH.write_text(res.model_dump_json(indent=2), encoding="utf-8")
+    write_match_store(res, stamp=_store_stamp(STORE_PATH))
     return res
 
 
-@app.post("/enrich", response_model=EnrichResponse)
-async def enrich(input: EnrichInput) -> EnrichResponse:
-    # Try LLM
-    llm = None
-    if settings.openai_api_key and ChatOpenAI is not None:
-        llm = ChatOpenAI(model=settings.openai_model, api_key=settings.openai_api_key, temperature=0.0)
-    if llm is not None:
-        try:
-            # For enrich, do not allow selecting the catch-all category (e.g., '전체')
-            cat_pool = get_enrich_category_pool()
-            tag_vocab = get_tag_vocab()[:120]
-            skill_vocab = get_skill_vocab()[:120]
-            prompt = (
-                "You are an assistant that generates concise, normalized metadata for matching.\n"
-                "Return STRICT JSON only, no commentary. Keys: \n"
-                "- suggested_category: string\n"
-                "- tags: array of 1..2 short lowercase tags (1-2 words each, hyphenated if needed, no punctuation, no duplicates)\n"
-                "- skills: array of 1..2 concise skills or capabilities (1-3 words each, Title Case, no duplicates)\n"
-                "- matching_tags: array of 3..10 lowercase tokens useful for matching (may include tags + key terms)\n"
-                "- confidence: number 0..1\n"
-                "Constraints:\n"
-                "- suggested_category MUST be chosen from this list only: " + json.dumps(cat_pool, ensure_ascii=False) + "\n"
-                "- Prefer using tags from this vocabulary when relevant: " + json.dumps(tag_vocab, ensure_ascii=False) + "\n"
-                "- Prefer using skills from this vocabulary when relevant: " + json.dumps(skill_vocab, ensure_ascii=False) + "\n"
-                f"TITLE: {input.title}\nDESC: {input.description}\nSKILLS: {input.skills}\nTAGS: {input.tags}\nCATEGORY: {input.category or ''}"
-            )
-            resp = await llm.ainvoke(prompt)
-            content = resp.content if hasattr(resp, "content") else str(resp)
-            import re, json as pyjson
-            m = re.search(r"\{[\s\S]*\}", content)
-            data = pyjson.loads(m.group(0)) if m else {}
-            suggested = data.get("suggested_category")
-            tags = data.get("tags") or []
-            skills = data.get("skills") or []
-            matching = data.get("matching_tags") or []
-            conf = float(data.get("confidence", 0.0))
-            if isinstance(tags, list):
-                tags = [str(t).strip().lower() for t in tags if str(t).strip()]
-            else:
-                tags = []
-            if isinstance(skills, list):
-                skills = [str(s).strip() for s in skills if str(s).strip()]
-            else:
-                skills = []
-            if isinstance(matching, list):
-                matching = [str(s).strip().lower() for s in matching if str(s).strip()]
-            else:
-                matching = []
-            # Snap to known vocabulary/pool
-            suggested = snap_one(suggested, get_enrich_category_pool())
-            tags = snap_list(tags, get_tag_vocab(), lower=True, cutoff=0.75, max_items=2)
-            skills = snap_list(skills, get_skill_vocab(), title_case=True, cutoff=0.75, max_items=2)
-            matching = snap_list((matching or tags), get_tag_vocab(), lower=True, cutoff=0.75, max_items=10)
-            # Ensure we always return a category other than '전체'
-            if not suggested and get_enrich_category_pool():
-                suggested = get_enrich_category_pool()[0]
-            return EnrichResponse(
-                suggestedCategory=suggested,
-                tags=tags[:2],
-                skills=skills[:2],
-                matchingTags=matching[:10],
-                confidence=max(0.0, min(1.0, conf)),
-            )
-        except Exception:
-            pass
+@lru_cache
+def _enrich_prompt_prefix() -> str:
+    """Static part of the /enrich prompt. Identical across calls so provider-side
+    prompt caching can reuse it; anything input-dependent goes after it.
+    """
+    # For enrich, do not allow selecting the catch-all category (e.g., '전체')
+    cat_pool = get_enrich_category_pool()
+    return (
+        "You are an assistant that generates concise, normalized metadata for matching.\n"
+        "Return STRICT JSON only, no commentary. Keys: \n"
+        "- suggested_category: string\n"
+        "- tags: array of 1..2 short lowercase tags (1-2 words each, hyphenated if needed, no punctuation, no duplicates)\n"
+        "- skills: array of 1..2 concise skills or capabilities (1-3 words each, Title Case, no duplicates)\n"
+        "- matching_tags: array of 3..10 lowercase tokens useful for matching (may include tags + key terms)\n"
+        "- confidence: number 0..1\n"
+        "Constraints:\n"
+        "- suggested_category MUST be chosen from this list only: " + json.dumps(cat_pool, ensure_ascii=False) + "\n"
+    )
+
+def build_enrich_prompt(input: EnrichInput) -> str:
+    """Static prefix + vocabulary ranked against this input + the input itself."""
+    text = " ".join([input.title, input.description, *input.skills, *input.tags, input.category or ""])
+    top_n = settings.enrich_vocab_top_n
+    tag_vocab = rank_vocab("tags", text, top_n)
+    skill_vocab = rank_vocab("skills", text, top_n)
+    return (
+        _enrich_prompt_prefix()
+        + "- Prefer using tags from this vocabulary when relevant: " + json.dumps(tag_vocab, ensure_ascii=False) + "\n"
+        + "- Prefer using skills from this vocabulary when relevant: " + json.dumps(skill_vocab, ensure_ascii=False) + "\n"
+        + f"TITLE: {input.title}\nDESC: {input.description}\nSKILLS: {input.skills}\nTAGS: {input.tags}\nCATEGORY: {input.category or ''}"
+    )
+
+
+# ----- Case corpus -----
+
+def analyze_case(title: str, description: str) -> dict:
+    """Tags/skills/category for an ingested case record, via the heuristic /enrich analyzer."""
+    return heuristic_enrich(EnrichInput(title=title, description=description)).model_dump()
+
+
+@lru_cache
+def _case_corpus() -> Tuple[Tuple[CardData, ...], Dict[str, int]]:
+    path = Path(settings.case_gives_path) if settings.case_gives_path else DEFAULT_CASES
+    if not path.exists():
+        return (), {}
+    cards: List[CardData] = []
+    positions: Dict[str, int] = {}
+    try:
+        for pos, card in enumerate(ingest_cases(path, analyze_case, limit=max(0, settings.case_gives_max))):
+            # As one of several shards, keep only this node's partition
+            if settings.shard_count > 1 and shard_of(card["id"], settings.shard_count) != settings.shard_index:
+                continue
+            cards.append(CardData.model_construct(**card))
+            positions[card["id"]] = pos
+    except (OSError, ValueError) as e:
+        print(f"[cases] skipping {path}: {e}")
+        return (), {}
+    return tuple(cards), positions
+
+
+def get_case_gives() -> Tuple[CardData, ...]:
+    """Give cards streamed from the case file (at most `case_gives_max`), so requests
+    with `includeCases` match against real project records too. Empty when missing/invalid.
+    """
+    return _case_corpus()[0]
+
+
+def case_position(card_id: str) -> Optional[int]:
+    """Position of a case card in the full case file order (also on a partial shard)."""
+    return _case_corpus()[1].get(card_id)
 
+
+def heuristic_enrich(input: EnrichInput) -> EnrichResponse:
+    """Offline /enrich analyzer: category, tags and skills from the text alone."""
     # Heuristic fallback: extract and rank tokens from title/desc/skills/tags (improved with Korean token simplify)
     tokens: List[str] = []
     for part in [input.title, input.description]:
@@ -601,43 +1806,56 @@ async def enrich(input: EnrichInput) -> EnrichResponse:
         weights[w] = float(wgt)
     uniq = [w for w, _ in sorted(weights.items(), key=lambda kv: kv[1], reverse=True)]
 
-    # Suggest category by overlap with known categories, then keyword mapping fallback
+    # Suggest category with the local classifier when confident, else by overlap with
+    # known categories, then keyword mapping, then the classifier's best guess
     suggested = None
     confidence = 0.0
-    try:
-        cat_pool = get_enrich_category_pool()
-        # score by substring overlap / token equality against filtered pool
-        best_score = -1.0
-        best_cat = None
-        for c in cat_pool:
-            c_norm = " ".join(normalize_and_tokenize(str(c)))
-            if not c_norm:
-                continue
-            score = 0.0
-            for tk in uniq:
-                if tk in c_norm:
-                    score += 1.0
-            if score > best_score:
-                best_score = score
-                best_cat = c
-        if best_cat and best_score > 0:
-            suggested = best_cat
-        else:
-            token_set = set([t.lower() for t in uniq])
-            keyword_map = [
-                ({"유기견", "반려", "동물", "보호소"}, ["안전", "치안/범죄예방", "공공서비스"]),
-                ({"cctv", "지오펜싱", "목격", "제보"}, ["치안/범죄예방", "안전"]),
-            ]
-            for keys, candidates in keyword_map:
-                if token_set & {k.lower() for k in keys}:
-                    for cand in candidates:
-                        if cand in cat_pool:
-                            suggested = cand
-                            break
-                if suggested:
-                    break
-    except Exception:
-        pass
+    clf_pick, clf_conf = None, 0.0
+    clf = get_category_classifier()
+    if clf is not None:
+        clf_pick, clf_conf = clf.predict_batch([
+            category_features(input.title, input.description, input.skills, input.tags)
+        ])[0]
+        if clf_pick and clf_conf >= settings.classifier_min_confidence:
+            suggested = clf_pick
+    if not suggested:
+        try:
+            cat_pool = get_enrich_category_pool()
+            # score by substring overlap / token equality against filtered pool
+            best_score = -1.0
+            best_cat = None
+            for c in cat_pool:
+                c_norm = " ".join(normalize_and_tokenize(str(c)))
+                if not c_norm:
+                    continue
+                score = 0.0
+                for tk in uniq:
+                    if tk in c_norm:
+                        score += 1.0
+                if score > best_score:
+                    best_score = score
+                    best_cat = c
+            if best_cat and best_score > 0:
+                suggested = best_cat
+            else:
+                token_set = set([t.lower() for t in uniq])
+                keyword_map = [
+                    ({"유기견", "반려", "동물", "보호소"}, ["안전", "치안/범죄예방", "공공서비스"]),
+                    ({"cctv", "지오펜싱", "목격", "제보"}, ["치안/범죄예방", "안전"]),
+                ]
+                for keys, candidates in keyword_map:
+                    if token_set & {k.lower() for k in keys}:
+                        for cand in candidates:
+                            if cand in cat_pool:
+                                suggested = cand
+                                break
+                    if suggested:
+                        break
+                if not suggested and clf_pick:
+                    # No overlap or keyword hit: take the classifier's best guess
+                    suggested = clf_pick
+        except Exception:
+            pass
 
     # Build skills from top n-grams (1..3 words) based on title+desc (skip stopwords)
     def top_ngrams(words: List[str], max_items: int = 7) -> List[str]:
@@ -700,3 +1918,53 @@ async def enrich(input: EnrichInput) -> EnrichResponse:
         matchingTags=matching,
         confidence=round(max(0.0, min(1.0, conf)), 2),
     )
+
+
+@app.post("/enrich", response_model=EnrichResponse)
+async def enrich(input: EnrichInput) -> EnrichResponse:
+    # Try LLM
+    llm = get_llm()
+    if llm is not None:
+        try:
+            prompt = build_enrich_prompt(input)
+            resp = await invoke_llm(llm, prompt, deadline=request_deadline())
+            content = resp.content if hasattr(resp, "content") else str(resp)
+            import re, json as pyjson
+            m = re.search(r"\{[\s\S]*\}", content)
+            data = pyjson.loads(m.group(0)) if m else {}
+            suggested = data.get("suggested_category")
+            tags = data.get("tags") or []
+            skills = data.get("skills") or []
+            matching = data.get("matching_tags") or []
+            conf = float(data.get("confidence", 0.0))
+            if isinstance(tags, list):
+                tags = [str(t).strip().lower() for t in tags if str(t).strip()]
+            else:
+                tags = []
+            if isinstance(skills, list):
+                skills = [str(s).strip() for s in skills if str(s).strip()]
+            else:
+                skills = []
+            if isinstance(matching, list):
+                matching = [str(s).strip().lower() for s in matching if str(s).strip()]
+            else:
+                matching = []
+            # Snap to known vocabulary/pool
+            suggested = snap_one(suggested, get_enrich_category_pool())
+            tags = snap_list(tags, get_tag_vocab(), lower=True, cutoff=0.75, max_items=2)
+            skills = snap_list(skills, get_skill_vocab(), title_case=True, cutoff=0.75, max_items=2)
+            matching = snap_list((matching or tags), get_tag_vocab(), lower=True, cutoff=0.75, max_items=10)
+            # Ensure we always return a category other than '전체'
+            if not suggested and get_enrich_category_pool():
+                suggested = get_enrich_category_pool()[0]
+            return EnrichResponse(
+                suggestedCategory=suggested,
+                tags=tags[:2],
+                skills=skills[:2],
+                matchingTags=matching[:10],
+                confidence=max(0.0, min(1.0, conf)),
+            )
+        except Exception:
+            pass
+
+    return heuristic_enrich(input)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Run a local scatter-gather cluster: N shard servers plus one coordinator.
+
+Each shard is a uvicorn process with SHARD_INDEX/SHARD_COUNT set, so it keeps only its
+partition of the case corpus; the coordinator gets MATCH_SHARDS pointing at them and
+serves /match by fanning out to POST /match/shard/prefilter and /match/shard/score.
+
+Usage (from server/):
+  python3 run_shards.py --shards 3                # coordinator on :8000, shards on :8001..
+  python3 run_shards.py --shards 3 --check        # start, compare with a single-node /match, stop
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List
+
+HERE = Path(__file__).resolve().parent
+
+
+def start_server(port: int, env: Dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=HERE, env={**os.environ, **env},
+    )
+
+
+def wait_ready(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/ready", timeout=2) as r:
+                if r.status == 200:
+                    return
+        except Exception:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready in {timeout:.0f}s")
+
+
+def post_match(url: str, body: dict) -> dict:
+    req = urllib.request.Request(f"{url}/match", data=json.dumps(body).encode("utf-8"),
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=60) as r:
+        return {"body": json.load(r), "missing": r.headers.get("X-Match-Missing-Shards")}
+
+
+def check(coordinator: str, single: str) -> bool:
+    """Compare coordinator and single-node /match on data.json (with the case corpus)."""
+    data = json.loads((HERE.parent / "data" / "data.json").read_text(encoding="utf-8"))
+    body = {"needs": data["needs"], "gives": data["gives"], "top_k": 5, "includeCases": True}
+    sharded, local = post_match(coordinator, body), post_match(single, body)
+    a, b = sharded["body"], local["body"]
+    same_needs = sum(1 for nid in b["needMatches"] if a["needMatches"].get(nid) == b["needMatches"][nid])
+    same_gives = a["giveMatches"] == b["giveMatches"]
+    print(f"needs with identical matches: {same_needs}/{len(b['needMatches'])}; "
+          f"giveMatches identical: {same_gives}; missing shards: {sharded['missing'] or 'none'}")
+    return same_needs == len(b["needMatches"]) and same_gives and not sharded["missing"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Start a local coordinator + shard cluster.")
+    parser.add_argument("--shards", type=int, default=3, help="Number of shard processes (default: 3)")
+    parser.add_argument("--port", type=int, default=8000, help="Coordinator port; shards use the next ports")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Coordinator MATCH_SHARD_TIMEOUT (default: the server's, LLM_REQUEST_BUDGET + 5)")
+    parser.add_argument("--check", action="store_true", help="Compare with a single node, then exit")
+    args = parser.parse_args()
+
+    shard_urls = [f"http://127.0.0.1:{args.port + 1 + i}" for i in range(args.shards)]
+    coordinator = f"http://127.0.0.1:{args.port}"
+    procs: List[subprocess.Popen] = []
+    try:
+        for i, url in enumerate(shard_urls):
+            procs.append(start_server(args.port + 1 + i, {
+                "SHARD_INDEX": str(i), "SHARD_COUNT": str(args.shards), "MATCH_SHARDS": "",
+            }))
+        coordinator_env = {"MATCH_SHARDS": ",".join(shard_urls)}
+        if args.timeout is not None:
+            coordinator_env["MATCH_SHARD_TIMEOUT"] = str(args.timeout)
+        procs.append(start_server(args.port, coordinator_env))
+        single = f"http://127.0.0.1:{args.port + 1 + args.shards}"
+        if args.check:
+            procs.append(start_server(args.port + 1 + args.shards, {"MATCH_SHARDS": ""}))
+        for url in [*shard_urls, coordinator, *([single] if args.check else [])]:
+            wait_ready(url)
+        if args.check:
+            sys.exit(0 if check(coordinator, single) else 1)
+        print(f"coordinator {coordinator} -> shards {', '.join(shard_urls)} (Ctrl-C to stop)")
+        procs[-1].wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for p in procs:
+            p.terminate()
+        for p in procs:
+            p.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Tests import the server modules the way uvicorn does (flat, from server/), and always use
+# the heuristic scorer on a single node, whatever the local environment sets.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ["OPENAI_API_KEY"] = ""
+os.environ["MATCH_SHARDS"] = ""
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    import main
+
+    with TestClient(main.app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def board():
+    """needs/gives from data/data.json."""
+    import json
+
+    import main
+
+    with main.FRONT_DATA.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {"needs": data["needs"], "gives": data["gives"]}
@@ -0,0 +1,124 @@
+"""CircuitBreaker: closed -> open -> half_open (one probe) -> closed / open again."""
+
+import asyncio
+
+import pytest
+
+import main
+from main import CircuitBreaker, LLMUnavailable
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(main.time, "monotonic", lambda: now[0])
+    return now
+
+
+def make_breaker(**kw):
+    opts = dict(window=4, min_calls=4, failure_ratio=0.5, slow_call=2.0, cooldown=10.0)
+    return CircuitBreaker(**{**opts, **kw})
+
+
+def trip(breaker):
+    for _ in range(breaker.min_calls):
+        breaker.record(False, 0.1)
+
+
+def test_opens_on_failure_ratio(clock):
+    b = make_breaker()
+    for ok in (True, True, False):
+        b.record(ok, 0.1)
+    assert b.state == "closed"  # fewer than min_calls
+    b.record(True, 2.5)  # slow calls count as failures: 2 of 4
+    assert b.state == "open"
+    assert b.allow() is None
+
+
+def test_stays_closed_below_ratio(clock):
+    b = make_breaker()
+    for ok in (True, True, True, False, True, True):
+        b.record(ok, 0.1)
+    assert b.state == "closed"
+    assert b.allow() == "closed"
+
+
+def test_single_probe_after_cooldown(clock):
+    b = make_breaker()
+    trip(b)
+    clock[0] += 9.9
+    assert b.allow() is None
+    clock[0] += 0.1
+    assert b.state == "half_open"
+    assert b.allow() == "probe"
+    assert b.allow() is None  # only one probe at a time
+    assert b.state == "half_open"
+
+
+def test_probe_success_closes(clock):
+    b = make_breaker()
+    trip(b)
+    clock[0] += 10
+    assert b.allow() == "probe"
+    b.record(True, 0.1, probe=True)
+    assert b.state == "closed"
+    # Outcomes from before the trip are forgotten
+    for _ in range(b.min_calls - 1):
+        b.record(False, 0.1)
+    assert b.state == "closed"
+
+
+def test_probe_failure_reopens(clock):
+    b = make_breaker()
+    trip(b)
+    clock[0] += 10
+    assert b.allow() == "probe"
+    b.record(False, 0.1, probe=True)
+    assert b.state == "open"
+    clock[0] += 10
+    assert b.allow() == "probe"
+
+
+def test_late_results_ignored_while_open(clock):
+    b = make_breaker()
+    trip(b)
+    b.record(True, 0.1)
+    clock[0] += 10
+    assert b.allow() == "probe"
+
+
+class HangingLLM:
+    def __init__(self):
+        self.called = asyncio.Event()
+
+    async def ainvoke(self, prompt):
+        self.called.set()
+        await asyncio.Event().wait()
+
+
+def test_cancelled_probe_releases_slot(monkeypatch):
+    b = make_breaker(cooldown=0.0)
+    trip(b)
+    monkeypatch.setattr(main, "llm_breaker", b)
+    monkeypatch.setattr(main.settings, "llm_hedge_delay", 0.0)
+
+    async def run():
+        llm = HangingLLM()
+        task = asyncio.ensure_future(main.invoke_llm(llm, "prompt"))
+        await llm.called.wait()
+        assert b.allow() is None  # the probe holds the slot
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert b.state == "half_open"
+    assert b.allow() == "probe"
+
+
+def test_open_breaker_skips_call(monkeypatch):
+    b = make_breaker()
+    trip(b)
+    monkeypatch.setattr(main, "llm_breaker", b)
+    with pytest.raises(LLMUnavailable):
+        asyncio.run(main.invoke_llm(HangingLLM(), "prompt"))
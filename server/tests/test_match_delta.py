@@ -0,0 +1,47 @@
+"""POST /match/delta must equal a full /match on the edited boards (heuristic scorer)."""
+
+import random
+
+import pytest
+
+
+def make_card(rnd, cid, tag_pool):
+    tags = rnd.sample(tag_pool, rnd.randint(1, 3))
+    return {"id": cid, "imageUrl": "", "category": rnd.choice(tag_pool), "title": " ".join(tags),
+            "description": "", "skills": [], "tags": tags, "matchingTags": rnd.sample(tag_pool, 1)}
+
+
+def edit_boards(rnd, needs, gives, tag_pool, counter):
+    """Edit, add and remove a few cards; returns the new boards and the edited ids."""
+    needs, gives = [dict(c) for c in needs], [dict(c) for c in gives]
+    changed = []
+    for side in (needs, gives):
+        for card in rnd.sample(side, min(2, len(side))):
+            card.update({k: v for k, v in make_card(rnd, card["id"], tag_pool).items() if k != "id"})
+            changed.append(card["id"])
+        for _ in range(rnd.randint(0, 2)):
+            side.insert(rnd.randint(0, len(side)), make_card(rnd, f"new-{next(counter)}", tag_pool))
+        for _ in range(rnd.randint(0, 2)):
+            if len(side) > 1:
+                side.pop(rnd.randrange(len(side)))
+    return needs, gives, changed
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_delta_equals_full_recompute(client, board, seed):
+    rnd = random.Random(seed)
+    tag_pool = sorted({t for c in board["needs"] + board["gives"] for t in c["tags"]})
+    counter = iter(range(10 ** 6))
+    top_k = rnd.choice([1, 2, 3, 5])
+    needs = [make_card(rnd, f"need-{i}", tag_pool) for i in range(rnd.randint(3, 15))]
+    gives = [make_card(rnd, f"give-{i}", tag_pool) for i in range(rnd.randint(3, 30))]
+    previous = client.post("/match", json={"needs": needs, "gives": gives, "top_k": top_k}).json()
+
+    for _ in range(3):
+        needs, gives, changed = edit_boards(rnd, needs, gives, tag_pool, counter)
+        delta = client.post("/match/delta", json={"previous": previous, "needs": needs, "gives": gives,
+                                                  "changedIds": changed, "top_k": top_k})
+        full = client.post("/match", json={"needs": needs, "gives": gives, "top_k": top_k})
+        assert delta.status_code == full.status_code == 200
+        assert delta.json() == full.json()
+        previous = delta.json()
@@ -0,0 +1,77 @@
+"""POST /match/fast answers exactly like /match, for valid and invalid bodies."""
+
+import json
+
+import pytest
+
+
+def post_both(client, body, **kw):
+    raw = body if isinstance(body, (str, bytes)) else json.dumps(body)
+    headers = {"content-type": "application/json"}
+    slow = client.post("/match", content=raw, headers=headers, **kw)
+    fast = client.post("/match/fast", content=raw, headers=headers, **kw)
+    return slow, fast
+
+
+def assert_same(slow, fast):
+    assert (fast.status_code, fast.json()) == (slow.status_code, slow.json())
+
+
+@pytest.mark.parametrize("top_k", [1, 3, 5])
+def test_same_result(client, board, top_k):
+    slow, fast = post_both(client, {**board, "top_k": top_k})
+    assert slow.status_code == 200
+    assert slow.json()["needMatches"]
+    assert_same(slow, fast)
+
+
+def test_same_compact_result(client, board):
+    slow, fast = post_both(client, board, params={"format": "compact"})
+    assert slow.status_code == 200
+    assert_same(slow, fast)
+
+
+@pytest.mark.parametrize("extra", [
+    {"top_k": "2"}, {"top_k": 2.0}, {"top_k": " 3 "}, {"top_k": True},
+    {"includeCases": 0}, {"includeCases": "no"}, {"includeCases": "off"},
+])
+def test_same_coercion(client, board, extra):
+    slow, fast = post_both(client, {**board, **extra})
+    assert slow.status_code == 200
+    assert_same(slow, fast)
+
+
+def card_with(board, **fields):
+    card = {**board["gives"][0], **fields}
+    return {"needs": board["needs"], "gives": [card, *board["gives"][1:]]}
+
+
+@pytest.mark.parametrize("body", [
+    "", "null", "[]", '"x"', '{"needs": [', '{"needs": []}',
+    {"needs": [], "gives": [], "top_k": 2.5},
+    {"needs": [], "gives": [], "top_k": "five"},
+    {"needs": [], "gives": [], "top_k": 2 ** 70, "includeCases": 2},
+    {"needs": [], "gives": [], "includeCases": 5.5},
+    {"needs": [1, None], "gives": {}},
+])
+def test_same_errors(client, body):
+    slow, fast = post_both(client, body)
+    assert slow.status_code == 422
+    assert_same(slow, fast)
+
+
+@pytest.mark.parametrize("fields", [
+    {"imageUrl": None}, {"imageUrl": 1}, {"duration": 5}, {"contact": []}, {"llmCategory": {}},
+    {"title": 1, "imageUrl": None}, {"skills": "a"}, {"tags": ["a", 1]}, {"llmTags": "a"},
+])
+def test_same_card_errors(client, board, fields):
+    slow, fast = post_both(client, card_with(board, **fields))
+    assert slow.status_code == 422
+    assert_same(slow, fast)
+
+
+def test_same_missing_fields(client, board):
+    card = {k: v for k, v in board["gives"][0].items() if k not in ("imageUrl", "tags")}
+    slow, fast = post_both(client, {"needs": board["needs"], "gives": [card]})
+    assert slow.status_code == 422
+    assert_same(slow, fast)
@@ -0,0 +1,89 @@
+"""SQLite match store (write_match_store / query_match_store) round-trips MatchResponse."""
+
+import random
+import sqlite3
+
+import pytest
+
+import main
+from main import CategorySuggestion, MatchResponse, MatchResult
+
+
+def make_response(rnd):
+    need_ids = [f"need-{i}" for i in range(rnd.randint(0, 8))]
+    give_ids = [f"give-{i}" for i in range(rnd.randint(0, 8))]
+    if need_ids and rnd.random() < 0.5:
+        give_ids.append(need_ids[0])  # the same id on both sides
+
+    def matches(others):
+        return [MatchResult(id=rnd.choice(others or ["x"]), score=rnd.choice([0.0, 0.25, 0.5, 1.0]))
+                for _ in range(rnd.randint(0, 4))]
+
+    suggestions = []
+    for cid in [*need_ids, *give_ids, "orphan-1", "orphan-1"]:
+        if rnd.random() < 0.7:
+            suggestions.append(CategorySuggestion(id=cid, originalCategory="a", suggestedCategory=rnd.choice("bcd"),
+                                                  confidence=rnd.random()))
+    return MatchResponse(
+        needMatches={nid: matches(give_ids) for nid in need_ids},
+        giveMatches={gid: matches(need_ids) for gid in give_ids},
+        categorySuggestions=suggestions,
+    )
+
+
+def pairs(coll):
+    return {eid: [(m.id, m.score) for m in ms] for eid, ms in coll.items()}
+
+
+def stored(tmp_path, res):
+    db = tmp_path / "matches.sqlite3"
+    main.write_match_store(res, stamp="test", db_path=db)
+    return sqlite3.connect(db)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_round_trip(tmp_path, seed):
+    res = make_response(random.Random(seed))
+    con = stored(tmp_path, res)
+    needs, gives, suggestions, cursor = main.query_match_store(con)
+    assert (needs, gives) == (pairs(res.needMatches), pairs(res.giveMatches))
+    assert suggestions == res.categorySuggestions
+    assert cursor is None
+    assert [p.name for p in tmp_path.iterdir()] == ["matches.sqlite3"]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_pages_add_up_to_everything(tmp_path, seed):
+    rnd = random.Random(seed)
+    res = make_response(rnd)
+    con = stored(tmp_path, res)
+    limit = rnd.randint(1, 4)
+    needs, gives, suggestions, cursor = {}, {}, [], None
+    while True:
+        n, g, s, cursor = main.query_match_store(con, cursor=cursor, limit=limit)
+        assert len(n) + len(g) <= limit
+        needs.update(n)
+        gives.update(g)
+        suggestions += s
+        if cursor is None:
+            break
+    assert (needs, gives) == (pairs(res.needMatches), pairs(res.giveMatches))
+    assert sorted(suggestions, key=repr) == sorted(res.categorySuggestions, key=repr)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_filters(tmp_path, seed):
+    rnd = random.Random(seed)
+    res = make_response(rnd)
+    con = stored(tmp_path, res)
+    need_id = next(iter(res.needMatches), "missing")
+    min_score, top_n = 0.25, rnd.randint(1, 3)
+    needs, gives, suggestions, _ = main.query_match_store(con, need_id=need_id, min_score=min_score, top_n=top_n)
+
+    expected = {}
+    if need_id in res.needMatches:
+        ranked = sorted(enumerate(res.needMatches[need_id]), key=lambda im: (-im[1].score, im[0]))
+        expected[need_id] = [(m.id, m.score) for _, m in ranked if m.score >= min_score][:top_n]
+    assert (needs, gives) == (expected, {})
+    # The picked need's suggestion, not one for a give that shares its id
+    assert suggestions == [c for c in res.categorySuggestions if c.id == need_id][:1]
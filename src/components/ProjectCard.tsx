@@ -1,6 +1,7 @@
 import svgPaths from "../imports/svg-63jcvnjryn";
 import { ImageWithFallback } from "./images_fb/ImageWithFallback";
 import { ExternalLink } from "lucide-react";
+import { imageSourcesForId } from "data";
 
 interface ProjectCardProps {
   id?: string;
@@ -112,7 +113,7 @@ export function ProjectCard({ id, imageUrl, category, title, contact, link, type
         </button>
       )}
       <div className="absolute h-[160px] left-0 top-0 w-[224px]">
-        <ImageWithFallback alt={title} className="absolute inset-0 max-w-none object-center object-cover pointer-events-none size-full rounded-tl-[8px] rounded-tr-[8px]" src={imageUrl} />
+        <ImageWithFallback alt={title} className="absolute inset-0 max-w-none object-center object-cover pointer-events-none size-full rounded-tl-[8px] rounded-tr-[8px]" src={imageUrl} sources={imageSourcesForId(id, imageUrl)} sizes="224px" />
       </div>
       
       <div className="absolute bg-[#f6f6f6] box-border content-stretch flex flex-col gap-[8px] items-start left-0 p-[16px] rounded-bl-[8px] rounded-br-[8px] top-[160px] w-full h-[160px]">
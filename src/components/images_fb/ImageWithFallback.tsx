@@ -3,14 +3,17 @@ import React, { useState } from 'react'
 const ERROR_IMG_SRC =
   'data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iODgiIGhlaWdodD0iODgiIHhtbG5zPSJodHRwOi8vd3d3LnczLm9yZy8yMDAwL3N2ZyIgc3Ryb2tlPSIjMDAwIiBzdHJva2UtbGluZWpvaW49InJvdW5kIiBvcGFjaXR5PSIuMyIgZmlsbD0ibm9uZSIgc3Ryb2tlLXdpZHRoPSIzLjciPjxyZWN0IHg9IjE2IiB5PSIxNiIgd2lkdGg9IjU2IiBoZWlnaHQ9IjU2IiByeD0iNiIvPjxwYXRoIGQ9Im0xNiA1OCAxNi0xOCAzMiAzMiIvPjxjaXJjbGUgY3g9IjUzIiBjeT0iMzUiIHI9IjciLz48L3N2Zz4KCg=='
 
-export function ImageWithFallback(props: React.ImgHTMLAttributes<HTMLImageElement>) {
+type ImageSource = { type?: string; srcSet: string }
+
+// `sources` renders a <picture>: typed entries become <source>, an untyped one is the <img> srcSet
+export function ImageWithFallback(props: React.ImgHTMLAttributes<HTMLImageElement> & { sources?: ImageSource[] }) {
   const [didError, setDidError] = useState(false)
 
   const handleError = () => {
     setDidError(true)
   }
 
-  const { src, alt, style, className, ...rest } = props
+  const { src, alt, style, className, sources, ...rest } = props
 
   return didError ? (
     <div
@@ -21,6 +24,13 @@ export function ImageWithFallback(props: React.ImgHTMLAttributes<HTMLImageElemen
         <img src={ERROR_IMG_SRC} alt="Error loading image" {...rest} data-original-url={src} />
       </div>
     </div>
+  ) : sources && sources.length ? (
+    <picture>
+      {sources.filter((s) => s.type).map((s) => (
+        <source key={s.type} type={s.type} srcSet={s.srcSet} sizes={rest.sizes} />
+      ))}
+      <img src={src} srcSet={sources.find((s) => !s.type)?.srcSet} alt={alt} className={className} style={style} {...rest} onError={handleError} />
+    </picture>
   ) : (
     <img src={src} alt={alt} className={className} style={style} {...rest} onError={handleError} />
   )